@@ -0,0 +1,175 @@
+import math
+import time
+from typing import List
+
+from catalog import Activity, get_candidate_activities
+from scheduler import schedule_day
+
+# Per-day limits of a plan
+DAY_HOURS = 9.0
+MAX_ACTIVITIES_PER_DAY = 3
+
+# Mood scores run 0-10 with 5 neutral; only activities that suit the mood better than that are planned
+MIN_MOOD_SCORE = 6
+
+# Resolution of the DP cost axis; costs are rounded up so plans never exceed the allowance
+COST_STEPS = 100
+# Above this many DP cells the bounded-time heuristic is used instead
+MAX_DP_CELLS = 250_000
+
+
+def select_activities(destination: str, mood: str, duration: int, allowance: int,
+                      day_hours: float = DAY_HOURS, max_per_day: int = MAX_ACTIVITIES_PER_DAY,
+                      time_limit: float = 0.005) -> List[List[str]]:
+    """Pick the activities that best fit the mood within the allowance and lay them out per day
+
+    The selection maximises the summed mood scores subject to the total cost
+    staying within ``allowance`` and at most ``max_per_day`` activities per day.
+    It is solved exactly with a knapsack DP when the table is small enough, which
+    covers every trip the app offers. Larger tables use a greedy selection improved
+    by swaps until ``time_limit`` seconds have passed.
+
+    Only activities scoring at least ``MIN_MOOD_SCORE`` for the mood are
+    considered, so spare slots stay free rather than being filled with
+    activities for another mood.
+    """
+    candidates = [a for a in get_candidate_activities(destination)
+                  if a.hours <= day_hours and a.score(mood) >= MIN_MOOD_SCORE]
+    slots = duration * max_per_day
+
+    count_limit = min(slots, len(candidates))
+    rows = 1 if count_limit == len(candidates) else count_limit
+    if len(candidates) * rows * (COST_STEPS + 1) <= MAX_DP_CELLS:
+        chosen = _solve_dp(candidates, mood, allowance, count_limit)
+    else:
+        chosen = _solve_greedy(candidates, mood, allowance, count_limit, time.perf_counter() + time_limit)
+
+    return _pack_days(chosen, candidates, mood, duration, allowance, day_hours, max_per_day)
+
+
+def _solve_dp(candidates: List[Activity], mood: str, allowance: int, count_limit: int) -> List[Activity]:
+    """0/1 knapsack over (activity count, cost) maximising the mood score"""
+    unit = max(1, math.ceil(allowance / COST_STEPS))
+    capacity = max(0, allowance) // unit
+    weights = [math.ceil(a.cost / unit) for a in candidates]
+    values = [a.score(mood) for a in candidates]
+
+    # The count dimension only matters when not every candidate fits in the slots
+    limit_count = count_limit < len(candidates)
+    rows = count_limit if limit_count else 1
+
+    # best[k][c]: best score with at most k activities (any number if not limit_count) costing at most c units
+    best = [[0] * (capacity + 1) for _ in range(rows + 1)]
+    taken = []
+
+    for i, (weight, value) in enumerate(zip(weights, values)):
+        item_flags = {}
+        if limit_count and i + 1 <= rows:
+            # Row i + 1 comes into use: at most i + 1 of the first i items is the same as at most i
+            best[i + 1] = best[i][:]
+        if weight <= capacity:
+            width = capacity + 1 - weight
+            # Rows above i + 1 cannot improve yet: only i + 1 activities have been seen
+            for k in range(min(rows, i + 1), 0, -1):
+                row = best[k]
+                prev = best[k - 1] if limit_count else row
+                with_item = [b + value for b in prev[:width]]
+                without = row[weight:]
+                item_flags[k] = bytes(w > o for w, o in zip(with_item, without))
+                row[weight:] = [w if w > o else o for w, o in zip(with_item, without)]
+        taken.append(item_flags)
+
+    # Walk back through the decisions
+    chosen = []
+    k, c = rows, capacity
+    for i in range(len(candidates) - 1, -1, -1):
+        # Rows above i + 1 equal row i + 1 for the first i + 1 items
+        flags = taken[i].get(min(k, i + 1))
+        weight = weights[i]
+        if flags is not None and c >= weight and flags[c - weight]:
+            chosen.append(candidates[i])
+            c -= weight
+            if limit_count:
+                k -= 1
+    chosen.reverse()
+    return chosen
+
+
+def _solve_greedy(candidates: List[Activity], mood: str, allowance: int, count_limit: int, deadline: float) -> List[Activity]:
+    """Score-per-rupee greedy selection, then improving swaps until the deadline"""
+    ranked = sorted(candidates, key=lambda a: a.score(mood) / (a.cost + 100), reverse=True)
+    chosen, spent = [], 0
+    for activity in ranked:
+        if len(chosen) < count_limit and spent + activity.cost <= allowance:
+            chosen.append(activity)
+            spent += activity.cost
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        outside = [a for a in candidates if a not in chosen]
+        for i, current in enumerate(chosen):
+            for replacement in outside:
+                gain = replacement.score(mood) - current.score(mood)
+                if gain > 0 and spent - current.cost + replacement.cost <= allowance:
+                    chosen[i] = replacement
+                    spent += replacement.cost - current.cost
+                    improved = True
+                    break
+            if improved or time.perf_counter() >= deadline:
+                break
+    return chosen
+
+
+def _pack_days(chosen: List[Activity], candidates: List[Activity], mood: str, duration: int,
+               allowance: int, day_hours: float, max_per_day: int) -> List[List[str]]:
+    """Spread the selection over the days, best activities first, each into the least busy day
+
+    A day only takes an activity if the scheduler can still fit all of them in
+    their opening hours. Busy time counts travel, so of similarly loaded days the
+    one with activities nearby wins.
+    """
+    days = [[] for _ in range(duration)]
+    hours = [0.0] * duration
+    spent = 0
+
+    def place(activity: Activity) -> bool:
+        best_day, best_key = None, None
+        for d in range(duration):
+            if len(days[d]) >= max_per_day or hours[d] + activity.hours > day_hours:
+                continue
+            schedule = schedule_day([a.name for a in days[d]] + [activity.name])
+            key = (schedule.busy_minutes, len(days[d]))
+            if schedule.feasible and (best_key is None or key < best_key):
+                best_day, best_key = d, key
+        if best_day is None:
+            return False
+        day = best_day
+        days[day].append(activity)
+        hours[day] += activity.hours
+        return True
+
+    for activity in sorted(chosen, key=lambda a: a.score(mood), reverse=True):
+        if place(activity):
+            spent += activity.cost
+
+    # The selection ignores per-day hours; refill slots freed by activities that did not fit
+    placed = {id(a) for day in days for a in day}
+    for activity in sorted(candidates, key=lambda a: a.score(mood), reverse=True):
+        if id(activity) not in placed and spent + activity.cost <= allowance and place(activity):
+            spent += activity.cost
+
+    # Days left empty by a tight allowance get the best free activity not planned yet that fits them
+    placed = {a.name for day in days for a in day}
+    free = sorted((a for a in candidates if a.cost == 0 and a.name not in placed),
+                  key=lambda a: a.score(mood), reverse=True)
+    for day in days:
+        if day:
+            continue
+        for activity in free:
+            if activity.hours <= day_hours and schedule_day([activity.name]).feasible:
+                day.append(activity)
+                free.remove(activity)
+                break
+
+    return [[activity.name for activity in day] for day in days]
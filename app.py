@@ -1,5 +1,10 @@
 import streamlit as st
 import os
+import uuid
+from catalog import BUDGETS, DESTINATIONS, MOODS, TRANSPORT_MODES
+from itinerary import Itinerary
+from recommender import get_recommender
+from speculation import SpeculativePrefetcher
 from trip_planner import TripPlanner
 
 # Page configuration
@@ -63,102 +68,187 @@ if 'trip_data' not in st.session_state:
     st.session_state.trip_data = None
 if 'planning_complete' not in st.session_state:
     st.session_state.planning_complete = False
+# Seeded here rather than with index= so suggestions can change it
+if 'destination_city' not in st.session_state:
+    st.session_state.destination_city = DESTINATIONS[1]
 
 # Main header
 st.markdown('<h1 class="main-header">✈️ VoyageGPT - AI Trip Planner</h1>', unsafe_allow_html=True)
 st.markdown("### Plan your perfect Indian adventure with AI-powered mood-based recommendations")
 
-# Indian destinations list
-DESTINATIONS = [
-    "Goa", "Manali", "Shimla", "Jaipur", "Udaipur", "Rishikesh", "Darjeeling", 
-    "Ooty", "Agra", "Varanasi", "Amritsar", "Kerala", "Munnar", "Hampi", 
-    "Ladakh", "Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata"
-]
+# Opt-in speculative prefetch of the reasoning call while options are being chosen
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "off") == "on"
 
-# Sidebar for inputs
-with st.sidebar:
-    st.markdown("## 🎯 Plan Your Trip")
-    
-    # Language selection for translation
-    st.markdown("### 🌐 Language Preference")
-    language_options = {
-        "English": "en",
-        "हिंदी (Hindi)": "hi",
-        "বাংলা (Bengali)": "bn", 
-        "தமிழ் (Tamil)": "ta",
-        "తెలుగు (Telugu)": "te",
-        "ગુજરાતી (Gujarati)": "gu",
-        "ಕನ್ನಡ (Kannada)": "kn",
-        "मराठी (Marathi)": "mr",
-        "ਪੰਜਾਬੀ (Punjabi)": "pa",
-        "മലയാളം (Malayalam)": "ml"
-    }
-    
-    selected_language = st.selectbox(
-        "Choose output language:",
-        list(language_options.keys()),
-        help="Select the language for your trip recommendations"
-    )
-    language_code = language_options[selected_language]
-    
-    # Check for API token
-    hf_token = os.getenv("HUGGING_FACE_TOKEN")
-    if not hf_token:
-        st.error("⚠️ Hugging Face token not found! Please set HUGGING_FACE_TOKEN environment variable.")
-        st.info("To get a token: Visit https://huggingface.co/settings/tokens")
-        st.stop()
-    
-    # User inputs
-    user_city = st.selectbox(
-        "🏠 From City",
-        options=DESTINATIONS,
-        index=0
-    )
-    
+
+@st.cache_resource
+def get_prefetcher():
+    """One prefetcher (and upstream call cap) shared by all sessions of this server"""
+    return SpeculativePrefetcher(TripPlanner())
+
+
+def trip_focus_inputs():
+    """Destination, mood and budget selectors, the inputs that determine the reasoning call"""
     destination_city = st.selectbox(
         "🎯 To Destination",
         options=DESTINATIONS,
-        index=1
+        key="destination_city"
     )
-    
+
     mood = st.selectbox(
         "🎭 Travel Mood",
-        options=["adventurous", "fun", "peaceful"],
+        options=MOODS,
         format_func=lambda x: {
             "adventurous": "🏔️ Adventurous",
             "fun": "🎉 Fun & Entertainment", 
             "peaceful": "🧘 Peaceful & Relaxing"
-        }[x]
+        }[x],
+        key="mood"
     )
-    
+
     budget = st.selectbox(
         "💰 Budget Level",
-        options=["budget", "mid-range", "luxury"],
+        options=BUDGETS,
         format_func=lambda x: {
             "budget": "💸 Budget (Under ₹50K)",
             "mid-range": "💳 Mid-range (₹50K-₹1.5L)",
             "luxury": "💎 Luxury (₹1.5L+)"
-        }[x]
+        }[x],
+        key="budget"
     )
     
-    duration = st.slider("📅 Trip Duration (days)", min_value=1, max_value=14, value=5)
+    return destination_city, mood, budget
+
+
+@st.fragment
+def speculative_trip_inputs():
+    """Selectors outside the form so their changes can start a speculation"""
+    destination_city, mood, budget = trip_focus_inputs()
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = str(uuid.uuid4())
+    
+    # Origin, duration and transport come from the last submitted form values
+    get_prefetcher().speculate(st.session_state.session_id, {
+        "destination_city": destination_city,
+        "mood": mood,
+        "budget": budget,
+        "user_city": st.session_state.get("user_city", DESTINATIONS[0]),
+        "duration": st.session_state.get("duration", 5),
+        "transport_mode": st.session_state.get("transport_mode", "flight")
+    })
+
+
+def use_suggestion(destination):
+    st.session_state.destination_city = destination
+    st.session_state.suggestion_applied = True
+
+
+@st.fragment
+def destination_suggestions():
+    """Suggested destinations for the chosen mood, budget and origin plus free-text keywords"""
+    with st.expander("✨ Suggest a destination"):
+        keywords = st.text_input(
+            "What are you looking for?",
+            placeholder="beaches, trekking, temples...",
+            key="suggest_keywords"
+        )
+        suggestions = get_recommender().recommend(
+            mood=st.session_state.get("mood"),
+            budget=st.session_state.get("budget"),
+            keywords=keywords,
+            origin=st.session_state.get("user_city"),
+            transport_mode=st.session_state.get("transport_mode"),
+            top_k=3
+        )
+        for suggestion in suggestions:
+            distance = f" · {suggestion['distance_km']:,} km" if suggestion["distance_km"] is not None else ""
+            st.button(
+                f"🎯 {suggestion['destination']}{distance}",
+                key=f"suggest_{suggestion['destination']}",
+                on_click=use_suggestion,
+                args=(suggestion["destination"],),
+                use_container_width=True
+            )
+    
+    # The destination selector lives outside this fragment, redraw the whole page to show the choice
+    if st.session_state.pop("suggestion_applied", False):
+        st.rerun()
+
+# Sidebar for inputs
+with st.sidebar:
+    st.markdown("## 🎯 Plan Your Trip")
+    
+    # Check for API token (only the Hugging Face backend needs one)
+    hf_token = os.getenv("HUGGING_FACE_TOKEN")
+    if os.getenv("GENERATION_BACKEND", "huggingface") == "huggingface" and not hf_token:
+        st.error("⚠️ Hugging Face token not found! Please set HUGGING_FACE_TOKEN environment variable.")
+        st.info("To get a token: Visit https://huggingface.co/settings/tokens")
+        st.stop()
     
-    transport_mode = st.selectbox(
-        "🚗 Transport Mode",
-        options=["flight", "train", "bus", "car", "bike"],
-        format_func=lambda x: {
-            "flight": "✈️ Flight",
-            "train": "🚂 Train",
-            "bus": "🚌 Bus",
-            "car": "🚗 Car",
-            "bike": "🏍️ Bike"
-        }[x]
-    )
+    destination_suggestions()
+    
+    if SPECULATIVE_PREFETCH:
+        speculative_trip_inputs()
+        destination_city = st.session_state.destination_city
+        mood = st.session_state.mood
+        budget = st.session_state.budget
+    
+    # Trip inputs are batched in a form so changing them does not rerun the script
+    with st.form("trip_form", border=False):
+        # Language selection for translation
+        st.markdown("### 🌐 Language Preference")
+        language_options = {
+            "English": "en",
+            "हिंदी (Hindi)": "hi",
+            "বাংলা (Bengali)": "bn", 
+            "தமிழ் (Tamil)": "ta",
+            "తెలుగు (Telugu)": "te",
+            "ગુજરાતી (Gujarati)": "gu",
+            "ಕನ್ನಡ (Kannada)": "kn",
+            "मराठी (Marathi)": "mr",
+            "ਪੰਜਾਬੀ (Punjabi)": "pa",
+            "മലയാളം (Malayalam)": "ml"
+        }
     
-    st.markdown("---")
+        selected_language = st.selectbox(
+            "Choose output language:",
+            list(language_options.keys()),
+            help="Select the language for your trip recommendations",
+            key="language"
+        )
+        language_code = language_options[selected_language]
+    
+        # User inputs
+        user_city = st.selectbox(
+            "🏠 From City",
+            options=DESTINATIONS,
+            index=0,
+            key="user_city"
+        )
+    
+        if not SPECULATIVE_PREFETCH:
+            destination_city, mood, budget = trip_focus_inputs()
+        
+        duration = st.slider("📅 Trip Duration (days)", min_value=1, max_value=14, value=5, key="duration")
+    
+        transport_mode = st.selectbox(
+            "🚗 Transport Mode",
+            options=TRANSPORT_MODES,
+            format_func=lambda x: {
+                "flight": "✈️ Flight",
+                "train": "🚂 Train",
+                "bus": "🚌 Bus",
+                "car": "🚗 Car",
+                "bike": "🏍️ Bike"
+            }[x],
+            key="transport_mode"
+        )
+    
+        st.markdown("---")
+        
+        # Generate trip button
+        submitted = st.form_submit_button("🚀 Generate Trip Plan", type="primary", use_container_width=True)
     
-    # Generate trip button
-    if st.button("🚀 Generate Trip Plan", type="primary", use_container_width=True):
+    if submitted:
         if user_city == destination_city:
             st.error("Please select different cities for origin and destination!")
         else:
@@ -166,6 +256,8 @@ with st.sidebar:
                 try:
                     # Initialize trip planner
                     planner = TripPlanner()
+                    if SPECULATIVE_PREFETCH:
+                        planner.prefetcher = get_prefetcher()
                     
                     # Generate trip
                     trip_data = planner.generate_itinerary(
@@ -178,6 +270,9 @@ with st.sidebar:
                         language=language_code
                     )
                     
+                    # Keep the compact tuple form in session state to save per-session memory
+                    if isinstance(trip_data, Itinerary):
+                        trip_data = trip_data.to_compact()
                     st.session_state.trip_data = trip_data
                     st.session_state.planning_complete = True
                     st.success("✅ Trip plan generated successfully!")
@@ -186,119 +281,147 @@ with st.sidebar:
                     st.error(f"❌ Error generating trip: {str(e)}")
 
 # Main content area
-if st.session_state.planning_complete and st.session_state.trip_data:
-    trip = st.session_state.trip_data
-    
-    # Trip overview
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("🎯 Destination", trip.get('destination', 'N/A'))
-    with col2:
-        st.metric("📅 Duration", f"{trip.get('duration', 0)} days")
-    with col3:
-        total_cost = trip.get('total_cost', 0)
-        if isinstance(total_cost, str):
-            st.metric("💰 Total Cost", total_cost)
-        else:
-            st.metric("💰 Total Cost", f"₹{total_cost:,}")
-    
-    st.markdown("---")
-    
-    # AI Reasoning
-    if trip.get('reasoning'):
-        st.markdown('<div class="section-header">🤖 Why This Destination?</div>', unsafe_allow_html=True)
-        st.write(trip["reasoning"])
-    
-    # Daily Itinerary
-    st.markdown('<div class="section-header">📋 Daily Itinerary</div>', unsafe_allow_html=True)
+PARTIAL_RESULT_NOTES = {
+    "fallback_reasoning": "⏱️ The AI service did not answer in time, so this plan uses our standard destination notes.",
+    "untranslated_reasoning": "🌐 The destination notes could not be translated in time and are shown in English.",
+    "untranslated_activities": "🌐 Some activities could not be translated in time and are shown in English."
+}
+
+
+def reset_trip():
+    st.session_state.trip_data = None
+    st.session_state.planning_complete = False
+
+
+@st.fragment
+def render_main_content():
+    """Results or welcome screen, rerun on its own when its widgets are used"""
+    if st.session_state.planning_complete and st.session_state.trip_data:
+        trip = st.session_state.trip_data
+        if isinstance(trip, tuple):
+            trip = Itinerary.from_compact(trip)
+    
+        # Say which parts of the plan were cut short by the time budget
+        for flag in trip.get('flags', []):
+            if flag in PARTIAL_RESULT_NOTES:
+                st.info(PARTIAL_RESULT_NOTES[flag])
+    
+        # Trip overview
+        col1, col2, col3 = st.columns(3)
     
-    for i, day in enumerate(trip.get('daily_plan', []), 1):
-        with st.expander(f"📅 Day {i}: {day.get('theme', 'Exploration')}", expanded=i <= 2):
+        with col1:
+            st.metric("🎯 Destination", trip.get('destination', 'N/A'))
+        with col2:
+            st.metric("📅 Duration", f"{trip.get('duration', 0)} days")
+        with col3:
+            total_cost = trip.get('total_cost', 0)
+            if isinstance(total_cost, str):
+                st.metric("💰 Total Cost", total_cost)
+            else:
+                st.metric("💰 Total Cost", f"₹{total_cost:,}")
+    
+        st.markdown("---")
+    
+        # AI Reasoning
+        if trip.get('reasoning'):
+            st.markdown('<div class="section-header">🤖 Why This Destination?</div>', unsafe_allow_html=True)
+            st.write(trip["reasoning"])
+    
+        # Daily Itinerary
+        st.markdown('<div class="section-header">📋 Daily Itinerary</div>', unsafe_allow_html=True)
+    
+        for i, day in enumerate(trip.get('daily_plan', []), 1):
+            with st.expander(f"📅 Day {i}: {day.get('theme', 'Exploration')}", expanded=i <= 2):
             
-            # Activities for the day
-            activities = day.get('activities', [])
-            if activities:
-                st.markdown("**🎯 Activities:**")
-                for activity in activities:
-                    st.markdown(f"• {activity}")
+                # Activities for the day
+                activities = day.get('activities', [])
+                schedule = day.get('schedule', [])
+                if schedule:
+                    st.markdown("**🎯 Activities:**")
+                    for item in schedule:
+                        st.markdown(f"• **{item['slot']}** {item['start']}–{item['end']}: {item['activity']}")
+                elif activities:
+                    st.markdown("**🎯 Activities:**")
+                    for activity in activities:
+                        st.markdown(f"• {activity}")
             
-            # Estimated cost for the day
-            day_cost = day.get('estimated_cost', 0)
-            if day_cost > 0:
-                st.markdown(f"**💰 Estimated Cost:** ₹{day_cost:,}")
-    
-    # Cost Breakdown
-    if trip.get('cost_breakdown'):
-        st.markdown('<div class="section-header">💰 Cost Breakdown</div>', unsafe_allow_html=True)
+                # Estimated cost for the day
+                day_cost = day.get('estimated_cost', 0)
+                if day_cost > 0:
+                    st.markdown(f"**💰 Estimated Cost:** ₹{day_cost:,}")
+    
+        # Cost Breakdown
+        if trip.get('cost_breakdown'):
+            st.markdown('<div class="section-header">💰 Cost Breakdown</div>', unsafe_allow_html=True)
         
-        cost_breakdown = trip['cost_breakdown']
+            cost_breakdown = trip['cost_breakdown']
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown("**🚗 Transport Costs:**")
-            st.write(f"• {transport_mode.title()}: ₹{cost_breakdown.get('transport', 0):,}")
+            with col1:
+                st.markdown("**🚗 Transport Costs:**")
+                st.write(f"• {trip['transport_details']['mode'].title()}: ₹{cost_breakdown.get('transport', 0):,}")
             
-            st.markdown("**🍽️ Food & Dining:**")
-            st.write(f"• Total food: ₹{cost_breakdown.get('food', 0):,}")
+                st.markdown("**🍽️ Food & Dining:**")
+                st.write(f"• Total food: ₹{cost_breakdown.get('food', 0):,}")
         
-        with col2:
-            st.markdown("**🏨 Accommodation:**")
-            st.write(f"• Total stay: ₹{cost_breakdown.get('accommodation', 0):,}")
+            with col2:
+                st.markdown("**🏨 Accommodation:**")
+                st.write(f"• Total stay: ₹{cost_breakdown.get('accommodation', 0):,}")
             
-            st.markdown("**🎭 Activities & Misc:**")
-            st.write(f"• Activities: ₹{cost_breakdown.get('activities', 0):,}")
-            st.write(f"• Miscellaneous: ₹{cost_breakdown.get('miscellaneous', 0):,}")
-    
-    # Reset button
-    st.markdown("---")
-    if st.button("🔄 Plan Another Trip", use_container_width=True):
-        st.session_state.trip_data = None
-        st.session_state.planning_complete = False
-        st.rerun()
+                st.markdown("**🎭 Activities & Misc:**")
+                st.write(f"• Activities: ₹{cost_breakdown.get('activities', 0):,}")
+                st.write(f"• Miscellaneous: ₹{cost_breakdown.get('miscellaneous', 0):,}")
+    
+        # Reset button
+        st.markdown("---")
+        # Clicking inside the fragment only reruns the fragment, not the whole script
+        st.button("🔄 Plan Another Trip", use_container_width=True, on_click=reset_trip, key="plan_another")
+
+    else:
+        # Welcome screen
+        st.markdown("## 🌟 Welcome to VoyageGPT!")
+    
+        col1, col2, col3 = st.columns(3)
+    
+        with col1:
+            st.markdown("""
+            ### 🎭 Mood-Based Planning
+            Choose from **Adventurous**, **Fun**, or **Peaceful** moods to get personalized recommendations that match your travel style.
+            """)
+    
+        with col2:
+            st.markdown("""
+            ### 🌐 AI-Powered Recommendations
+            Get intelligent trip suggestions powered by advanced language models that understand your preferences and budget.
+            """)
+    
+        with col3:
+            st.markdown("""
+            ### 💰 Smart Budgeting
+            Get realistic cost breakdowns with transport, accommodation, food, and activity estimates for Indian destinations.
+            """)
+    
+        st.markdown("---")
+    
+        # Featured destinations
+        st.markdown("### 🗺️ Popular Destinations")
+    
+        recommender = get_recommender()
+        featured_destinations = [
+            (mood_type, [r["destination"] for r in recommender.recommend(mood=mood_key, top_k=4)])
+            for mood_type, mood_key in [("🏔️ Adventurous", "adventurous"), ("🎉 Fun", "fun"), ("🧘 Peaceful", "peaceful")]
+        ]
+    
+        for mood_type, destinations in featured_destinations:
+            st.markdown(f"**{mood_type}:** {' • '.join(destinations)}")
+    
+        st.markdown("---")
+        st.markdown("### 🚀 Get Started")
+        st.markdown("Use the sidebar to select your preferences and generate your personalized AI-powered trip plan!")
+
 
-else:
-    # Welcome screen
-    st.markdown("## 🌟 Welcome to VoyageGPT!")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        ### 🎭 Mood-Based Planning
-        Choose from **Adventurous**, **Fun**, or **Peaceful** moods to get personalized recommendations that match your travel style.
-        """)
-    
-    with col2:
-        st.markdown("""
-        ### 🌐 AI-Powered Recommendations
-        Get intelligent trip suggestions powered by advanced language models that understand your preferences and budget.
-        """)
-    
-    with col3:
-        st.markdown("""
-        ### 💰 Smart Budgeting
-        Get realistic cost breakdowns with transport, accommodation, food, and activity estimates for Indian destinations.
-        """)
-    
-    st.markdown("---")
-    
-    # Featured destinations
-    st.markdown("### 🗺️ Popular Destinations")
-    
-    featured_destinations = [
-        ("🏔️ Adventurous", ["Ladakh", "Rishikesh", "Manali", "Himachal Pradesh"]),
-        ("🎉 Fun", ["Goa", "Mumbai", "Delhi", "Bangalore"]),
-        ("🧘 Peaceful", ["Kerala", "Ooty", "Shimla", "Darjeeling"])
-    ]
-    
-    for mood_type, destinations in featured_destinations:
-        st.markdown(f"**{mood_type}:** {' • '.join(destinations)}")
-    
-    st.markdown("---")
-    st.markdown("### 🚀 Get Started")
-    st.markdown("Use the sidebar to select your preferences and generate your personalized AI-powered trip plan!")
+render_main_content()
 
 # Footer
 st.markdown("---")
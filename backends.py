@@ -0,0 +1,320 @@
+import asyncio
+import os
+import time
+import requests
+from typing import Dict, List, Optional
+
+from catalog import DESTINATION_INFO, get_activity_days
+from deadline import Deadline
+from recommender import MOODS, get_recommender
+
+# Optional non-blocking HTTP client for the async service
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+MOOD_REASONS = {
+    "adventurous": "thrilling outdoor experiences and off-the-beaten-path adventures",
+    "fun": "entertainment, social activities and a lively atmosphere",
+    "peaceful": "tranquil surroundings, nature walks and a relaxed pace"
+}
+
+
+class GenerationBackend:
+    """Interface the planner uses to turn a prompt into text
+
+    ``generate`` returns None when the backend could not produce an answer so the
+    planner can decide how to fall back. ``request`` carries the structured trip
+    parameters for backends that do not need the prompt text. ``settings`` holds
+    ``max_new_tokens`` and ``stop`` sequences chosen by the planner. A ``deadline``
+    bounds every upstream attempt; once it has passed the backend gives up and
+    returns None.
+    """
+
+    name = "base"
+    # Whether answers are worth storing in the itinerary cache
+    cacheable = True
+
+    def generate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                 settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        raise NotImplementedError
+
+    async def agenerate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                        settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Async variant of ``generate``; runs the blocking call in a worker thread by default"""
+        return await asyncio.to_thread(self.generate, prompt, model, request, settings, deadline)
+
+
+class HuggingFaceBackend(GenerationBackend):
+    """Hugging Face inference API with fallback models"""
+
+    name = "huggingface"
+
+    def __init__(self, token: Optional[str] = None, models: Optional[List[str]] = None,
+                 api_base: str = "https://api-inference.huggingface.co/models"):
+        # Get Hugging Face API token from environment
+        self.hf_token = token or os.getenv("HUGGING_FACE_TOKEN")
+        if not self.hf_token:
+            raise ValueError("HUGGING_FACE_TOKEN environment variable is required. Please set it in your environment or .env file.")
+        self.api_base = api_base
+
+        # Alternative free small models to try (optimized for size)
+        self.models = models or [
+            "EleutherAI/gpt-neo-125M",  # Small and fast
+            "gpt2",  # Reliable small model
+            "facebook/blenderbot-400M-distill",  # Compact conversational model
+            "microsoft/DialoGPT-small"  # Smaller DialoGPT variant
+        ]
+
+        self.headers = {
+            "Authorization": f"Bearer {self.hf_token}",
+            "Content-Type": "application/json"
+        }
+
+    def _payload(self, prompt: str, settings: Optional[Dict]) -> Dict:
+        settings = settings or {}
+        parameters = {
+            "max_new_tokens": settings.get("max_new_tokens", 500),
+            "temperature": 0.7,
+            "do_sample": True,
+            "top_p": 0.9,
+            # Only the continuation is used, do not send the prompt back
+            "return_full_text": False
+        }
+        if settings.get("stop"):
+            parameters["stop"] = settings["stop"]
+        return {"inputs": prompt, "parameters": parameters}
+
+    def _extract_text(self, result) -> str:
+        """Handle the different response formats of the inference API"""
+        if isinstance(result, list) and len(result) > 0:
+            if "generated_text" in result[0]:
+                return result[0]["generated_text"]
+            elif "text" in result[0]:
+                return result[0]["text"]
+        elif isinstance(result, dict):
+            if "generated_text" in result:
+                return result["generated_text"]
+            elif "text" in result:
+                return result["text"]
+
+        return str(result)
+
+    def generate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                 settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Try each model in turn, returning None if none of them answered in time"""
+        models_to_try = [model] if model is not None else self.models
+        deadline = deadline or Deadline()
+
+        for model_name in models_to_try:
+            if not model_name:
+                continue
+            if deadline.expired():
+                break
+
+            try:
+                response = requests.post(
+                    f"{self.api_base}/{model_name}",
+                    headers=self.headers,
+                    json=self._payload(prompt, settings),
+                    timeout=deadline.timeout(30)
+                )
+
+                if response.status_code == 200:
+                    return self._extract_text(response.json())
+
+                elif response.status_code == 503:
+                    # Model is loading, wait and retry
+                    time.sleep(deadline.timeout(2))
+                    continue
+
+            except requests.exceptions.RequestException as e:
+                print(f"Error with model {model_name}: {e}")
+                continue
+
+        return None
+
+    async def agenerate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                        settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        if not AIOHTTP_AVAILABLE:
+            return await super().agenerate(prompt, model, request, settings, deadline)
+
+        models_to_try = [model] if model is not None else self.models
+        deadline = deadline or Deadline()
+
+        async with aiohttp.ClientSession(headers=self.headers) as session:
+            for model_name in models_to_try:
+                if not model_name:
+                    continue
+                if deadline.expired():
+                    break
+
+                timeout = aiohttp.ClientTimeout(total=deadline.timeout(30))
+                try:
+                    async with session.post(f"{self.api_base}/{model_name}", json=self._payload(prompt, settings),
+                                            timeout=timeout) as response:
+                        if response.status == 200:
+                            return self._extract_text(await response.json(content_type=None))
+
+                        elif response.status == 503:
+                            # Model is loading, wait without blocking other requests
+                            await asyncio.sleep(deadline.timeout(2))
+                            continue
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"Error with model {model_name}: {e}")
+                    continue
+
+        return None
+
+
+class OpenAICompatibleBackend(GenerationBackend):
+    """Any server speaking the OpenAI chat completions API (llama.cpp, vLLM, ...)"""
+
+    name = "openai"
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None,
+                 api_key: Optional[str] = None, timeout: int = 30):
+        self.base_url = (base_url or os.getenv("LOCAL_LLM_URL", "http://localhost:8000/v1")).rstrip("/")
+        self.model = model or os.getenv("LOCAL_LLM_MODEL", "default")
+        self.timeout = timeout
+
+        self.headers = {"Content-Type": "application/json"}
+        api_key = api_key or os.getenv("LOCAL_LLM_API_KEY")
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _payload(self, prompt: str, model: Optional[str], settings: Optional[Dict]) -> Dict:
+        settings = settings or {}
+        payload = {
+            "model": model or self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": settings.get("max_new_tokens", 500),
+            "temperature": 0.7,
+            "top_p": 0.9
+        }
+        if settings.get("stop"):
+            # The OpenAI API accepts at most four stop sequences
+            payload["stop"] = settings["stop"][:4]
+        return payload
+
+    def _extract_text(self, result: Dict) -> Optional[str]:
+        choices = result.get("choices") or []
+        if choices:
+            return choices[0].get("message", {}).get("content") or choices[0].get("text")
+        return None
+
+    def generate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                 settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        deadline = deadline or Deadline()
+        if deadline.expired():
+            return None
+        try:
+            response = requests.post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                json=self._payload(prompt, model, settings),
+                timeout=deadline.timeout(self.timeout)
+            )
+            if response.status_code == 200:
+                return self._extract_text(response.json())
+            print(f"Local model server returned {response.status_code}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error with local model server: {e}")
+
+        return None
+
+    async def agenerate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                        settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        if not AIOHTTP_AVAILABLE:
+            return await super().agenerate(prompt, model, request, settings, deadline)
+
+        deadline = deadline or Deadline()
+        if deadline.expired():
+            return None
+        timeout = aiohttp.ClientTimeout(total=deadline.timeout(self.timeout))
+        try:
+            async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
+                async with session.post(f"{self.base_url}/chat/completions", json=self._payload(prompt, model, settings)) as response:
+                    if response.status == 200:
+                        return self._extract_text(await response.json(content_type=None))
+                    print(f"Local model server returned {response.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"Error with local model server: {e}")
+
+        return None
+
+
+class TemplateBackend(GenerationBackend):
+    """Deterministic answers built from the destination recommender and the activity catalog"""
+
+    name = "template"
+    cacheable = False
+
+    async def agenerate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                        settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        # Pure computation, no need for a worker thread
+        return self.generate(prompt, model, request, settings, deadline)
+
+    def generate(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                 settings: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[str]:
+        if not request or not request.get("destination_city"):
+            return self.fallback_response(prompt, request)
+
+        destination = request["destination_city"]
+        mood = request.get("mood", "fun")
+        highlights = [activity for day in get_activity_days(destination, mood) for activity in day]
+
+        duration = request.get("duration")
+        trip = f"{duration}-day {mood} trip" if duration else f"{mood} trip"
+        if request.get("user_city"):
+            trip += f" from {request['user_city']}"
+        if request.get("transport_mode"):
+            trip += f" by {request['transport_mode']}"
+        spending = f"suits {request['budget']}-level spending and " if request.get("budget") else ""
+
+        lines = [
+            f"I recommend {destination} for your {trip}.",
+            "",
+            f"{destination} {spending}offers {MOOD_REASONS.get(mood, 'a memorable experience')}.",
+            "",
+            *([f"It is known for {DESTINATION_INFO[destination][-1]}.", ""]
+              if destination in DESTINATION_INFO else []),
+            "Highlights include:"
+        ]
+        lines.extend(f"- {activity}" for activity in highlights[:6])
+        return "\n".join(lines)
+
+    def fallback_response(self, prompt: str, request: Optional[Dict] = None) -> str:
+        """Generate a basic response when API is unavailable"""
+        if request and request.get("destination_city"):
+            return self.generate(prompt, request=request)
+
+        # Without trip parameters, recommend the destination that best matches the prompt text
+        request = dict(request or {})
+        recommender = get_recommender()
+        best = recommender.recommend(
+            mood=request.get("mood"), budget=request.get("budget"), keywords=prompt,
+            origin=request.get("user_city"), transport_mode=request.get("transport_mode"), top_k=1
+        )[0]["destination"]
+        request["destination_city"] = best
+        if request.get("mood") not in MOODS:
+            request["mood"] = MOODS[int(recommender.mood_scores[recommender.index[best]].argmax())]
+        return self.generate(prompt, request=request)
+
+
+BACKENDS = {
+    HuggingFaceBackend.name: HuggingFaceBackend,
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend,
+    TemplateBackend.name: TemplateBackend
+}
+
+
+def create_backend(name: Optional[str] = None) -> GenerationBackend:
+    """Create the backend selected by name or the GENERATION_BACKEND environment variable"""
+    name = name or os.getenv("GENERATION_BACKEND", HuggingFaceBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown generation backend '{name}'. Choose one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
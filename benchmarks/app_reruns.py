@@ -0,0 +1,136 @@
+"""Script-run counts and run times of app.py under Streamlit's testing harness
+
+Usage: python benchmarks/app_reruns.py [sessions] [--baseline OLD_APP.py]
+
+Replays a typical session (set six trip inputs, generate, plan another trip)
+and counts how often the script actually executes from the top. A counter in
+session state is prepended to the app source, so fragment reruns, which do
+not execute the top of the script, are not counted. As in a browser, changing
+a widget outside a form triggers a run; widgets inside a form only send their
+values with the submit button.
+
+AppTest always reruns the whole script, so the "Plan Another Trip" click,
+which a browser handles as a rerun of the results fragment only, is counted as
+a full run here. The counts for the current app are an upper bound.
+
+Pass an older app.py, e.g. ``git show <commit>:app.py > /tmp/app_old.py``, to
+measure it the same way for comparison.
+
+The template backend is used so the numbers do not include upstream latency.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("GENERATION_BACKEND", "template")
+os.environ.setdefault("ITINERARY_CACHE", "off")
+# Older versions of the app stop without a token even when it is not used
+os.environ.setdefault("HUGGING_FACE_TOKEN", "unused")
+
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+sys.path.insert(0, REPO_ROOT)
+
+RUN_COUNTER = (
+    "import streamlit as _bench_st\n"
+    "_bench_st.session_state['_bench_script_runs'] = _bench_st.session_state.get('_bench_script_runs', 0) + 1\n"
+)
+
+# (widget label, value) in the order a user would set them
+TRIP_INPUTS = [
+    ("🏠 From City", "Mumbai"),
+    ("🎯 To Destination", "Goa"),
+    ("🎭 Travel Mood", "fun"),
+    ("💰 Budget Level", "mid-range"),
+    ("📅 Trip Duration (days)", 14),
+    ("🚗 Transport Mode", "train")
+]
+
+
+def script_runs(at: AppTest) -> int:
+    return at.session_state["_bench_script_runs"]
+
+
+def timed_run(at: AppTest, timings: list):
+    start = time.perf_counter()
+    at.run()
+    timings.append((time.perf_counter() - start) * 1000)
+
+
+def find_widget(at: AppTest, label: str):
+    widgets = at.slider if label.startswith("📅") else at.selectbox
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def find_button(at: AppTest, text: str):
+    return next(button for button in at.button if text in button.label)
+
+
+def replay_session(source: str, timings: list) -> dict:
+    """Run one user session, returning the script runs of each step after the page load"""
+    at = AppTest.from_string(source, default_timeout=60)
+    at.run()
+    counts = {}
+
+    before = script_runs(at)
+    for label, value in TRIP_INPUTS:
+        widget = find_widget(at, label)
+        widget.set_value(value)
+        if not widget.form_id:
+            timed_run(at, timings)
+    counts["inputs"] = script_runs(at) - before
+
+    before = script_runs(at)
+    find_button(at, "Generate Trip Plan").click()
+    timed_run(at, timings)
+    assert at.session_state.planning_complete
+    counts["generate"] = script_runs(at) - before
+
+    before = script_runs(at)
+    find_button(at, "Plan Another Trip").click()
+    timed_run(at, timings)
+    assert not at.session_state.planning_complete
+    counts["reset"] = script_runs(at) - before
+
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def measure(path: str, sessions: int) -> dict:
+    with open(path, encoding="utf-8") as f:
+        source = RUN_COUNTER + f.read()
+    timings = []
+    runs = [replay_session(source, timings) for _ in range(sessions)]
+    result = {step: statistics.mean(r[step] for r in runs) for step in runs[0]}
+    result["median_ms"] = statistics.median(timings)
+    result["max_ms"] = max(timings)
+    return result
+
+
+def report(name: str, result: dict):
+    print(f"{name}: {result['total']:g} script runs per session "
+          f"(inputs {result['inputs']:g}, generate {result['generate']:g}, plan another {result['reset']:g}); "
+          f"run time median {result['median_ms']:.1f} ms, max {result['max_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", type=int, nargs="?", default=5)
+    parser.add_argument("--baseline", help="Older app.py to measure the same way")
+    args = parser.parse_args()
+
+    current = measure(APP_PATH, args.sessions)
+    report("app.py", current)
+    if args.baseline:
+        baseline = measure(args.baseline, args.sessions)
+        report("baseline", baseline)
+        saved = (baseline["total"] - current["total"]) * current["median_ms"]
+        print(f"Script runs saved per session: {baseline['total'] - current['total']:g} (about {saved:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Time to select, pack and schedule the activities of a 14-day trip
+
+Usage: python benchmarks/day_schedules.py
+
+Runs the activity solver and the intra-day scheduler for every destination,
+mood and budget tier, once with empty scheduler memos (first trip after a
+restart) and once warm, and reports the median and worst times. The target is
+well under 100 ms per trip.
+"""
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from activity_solver import select_activities
+from catalog import DESTINATIONS
+from scheduler import _schedule, schedule_day
+
+DURATION = 14
+# Per-day activity allowance of each budget tier, as in TripPlanner
+ALLOWANCES = {"budget": 1000, "mid-range": 2500, "luxury": 6000}
+MOODS = ("adventurous", "fun", "peaceful")
+
+
+def plan_days(destination: str, mood: str, allowance: int) -> list:
+    days = select_activities(destination, mood, DURATION, allowance * DURATION)
+    return [schedule_day(day) for day in days]
+
+
+def timed(destination: str, mood: str, allowance: int) -> float:
+    start = time.perf_counter()
+    schedules = plan_days(destination, mood, allowance)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert all(schedule.feasible for schedule in schedules), (destination, mood, allowance)
+    return elapsed
+
+
+def main():
+    trips = [(d, m, a) for d in DESTINATIONS + ["Rajasthan"] for m in MOODS for a in ALLOWANCES.values()]
+
+    cold = []
+    for trip in trips:
+        _schedule.cache_clear()
+        cold.append(timed(*trip))
+    warm = [timed(*trip) for trip in trips]
+
+    print(f"{len(trips)} trips of {DURATION} days, every day within opening hours")
+    print(f"Cold: median {statistics.median(cold):.1f} ms, max {max(cold):.1f} ms")
+    print(f"Warm: median {statistics.median(warm):.1f} ms, max {max(warm):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
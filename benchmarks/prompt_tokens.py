@@ -0,0 +1,66 @@
+"""Prompt and completion token budgets of the compact and detailed trip prompts
+
+Usage: python benchmarks/prompt_tokens.py
+
+Counts the prompt tokens of both prompt styles over a spread of sample trips and
+prints the completion limit the planner now sends. Uses the GPT-2 tokenizer
+(tiktoken or transformers) when one is installed, otherwise a word/punctuation
+approximation, so absolute numbers vary by model but the ratio holds.
+"""
+import os
+import re
+import statistics
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from trip_planner import GenerationController, TripPrompts
+
+SAMPLE_TRIPS = [
+    ("adventurous", "budget", 3, "Delhi", "Manali", "bus"),
+    ("fun", "mid-range", 5, "Mumbai", "Goa", "train"),
+    ("peaceful", "luxury", 7, "Bangalore", "Kerala", "flight"),
+    ("fun", "budget", 4, "Jaipur", "Rajasthan", "car"),
+    ("peaceful", "mid-range", 10, "Kolkata", "Darjeeling", "train"),
+    ("adventurous", "luxury", 14, "Chennai", "Ladakh", "flight")
+]
+
+
+def load_tokenizer():
+    """Return (name, count function) for the best tokenizer available"""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("gpt2")
+        return "tiktoken gpt2", lambda text: len(encoding.encode(text))
+    except ImportError:
+        pass
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained("gpt2")
+        return "transformers gpt2", lambda text: len(tokenizer.encode(text))
+    except Exception:
+        pass
+    pattern = re.compile(r"\w+|[^\w\s]")
+    return "word/punctuation approximation", lambda text: len(pattern.findall(text))
+
+
+def main():
+    name, count_tokens = load_tokenizer()
+    print(f"Tokenizer: {name}")
+
+    styles = {style: TripPrompts(style=style) for style in ("detailed", "compact")}
+    counts = {style: [count_tokens(prompts.create_trip_prompt(*trip)) for trip in SAMPLE_TRIPS]
+              for style, prompts in styles.items()}
+
+    for style, values in counts.items():
+        print(f"{style:>8} prompt: median {statistics.median(values):.0f} tokens, max {max(values)}")
+    saved = 1 - statistics.median(counts["compact"]) / statistics.median(counts["detailed"])
+    print(f"Prompt tokens saved by the compact template: {saved:.0%}")
+
+    settings = GenerationController().settings()
+    print(f"Completion limit: max_new_tokens {settings['max_new_tokens']} (was 500), stop {settings['stop']!r}")
+
+
+if __name__ == "__main__":
+    main()
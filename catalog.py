@@ -0,0 +1,396 @@
+from typing import List
+
+# Daily activity triples per destination and mood
+ACTIVITY_CATALOG = {
+    "Goa": {
+        "adventurous": [
+            ["Water sports at Baga Beach", "Scuba diving", "Jet skiing"],
+            ["Dudhsagar Falls trek", "Spice plantation tour", "Kayaking"],
+            ["Parasailing", "Dolphin spotting cruise", "Beach volleyball"]
+        ],
+        "fun": [
+            ["Beach hopping", "Flea market shopping", "Beach parties"],
+            ["Casino cruise", "Nightlife in Tito's", "Live music venues"],
+            ["Food tours", "Local bars", "Cultural shows"]
+        ],
+        "peaceful": [
+            ["Sunrise meditation on beach", "Ayurvedic spa", "Quiet beach walks"],
+            ["Old Goa churches", "Peaceful backwaters", "Yoga sessions"],
+            ["Sunset watching", "Reading by the beach", "Nature photography"]
+        ]
+    },
+    "Manali": {
+        "adventurous": [
+            ["Rohtang Pass adventure", "River rafting", "Paragliding"],
+            ["Solang Valley skiing", "Mountain biking", "Rock climbing"],
+            ["Trekking to Bhrigu Lake", "Adventure sports", "Camping"]
+        ],
+        "fun": [
+            ["Mall Road shopping", "Local cafes", "Cultural programs"],
+            ["Apple orchard visits", "Local festivals", "Mountain railways"],
+            ["Photography tours", "Local markets", "Folk performances"]
+        ],
+        "peaceful": [
+            ["Hidimba Temple visit", "Nature walks", "Mountain meditation"],
+            ["Hot springs relaxation", "Quiet mountain views", "Bird watching"],
+            ["Peaceful forest walks", "Sunset points", "Reading in nature"]
+        ]
+    },
+    "Rajasthan": {
+        "adventurous": [
+            ["Desert safari", "Camel riding", "Dune bashing"],
+            ["Fort exploration", "Heritage walks", "Desert camping"],
+            ["Hot air ballooning", "Wildlife safari", "Adventure tours"]
+        ],
+        "fun": [
+            ["Cultural shows", "Folk dance", "Royal dining"],
+            ["Colorful markets", "Handicraft shopping", "Palace tours"],
+            ["Festival celebrations", "Traditional cuisine", "Local entertainment"]
+        ],
+        "peaceful": [
+            ["Palace gardens", "Quiet temples", "Lakeside meditation"],
+            ["Sunrise palace views", "Peaceful courtyards", "Garden walks"],
+            ["Traditional art viewing", "Quiet museums", "Spiritual sites"]
+        ]
+    }
+}
+
+# Used for destinations without a dedicated entry
+GENERIC_ACTIVITIES = {
+    "adventurous": [
+        ["Local adventure sports", "Outdoor activities", "Hiking trails"],
+        ["Cultural exploration", "Local tours", "Adventure experiences"],
+        ["Nature activities", "Exciting experiences", "Local adventures"]
+    ],
+    "fun": [
+        ["Local entertainment", "Cultural shows", "Shopping"],
+        ["Social activities", "Local festivals", "Food tours"],
+        ["Nightlife exploration", "Local experiences", "Entertainment venues"]
+    ],
+    "peaceful": [
+        ["Nature walks", "Quiet places", "Meditation spots"],
+        ["Peaceful attractions", "Serene locations", "Relaxation"],
+        ["Spiritual sites", "Calm experiences", "Quiet exploration"]
+    ]
+}
+
+DEFAULT_ACTIVITIES = [["Explore local attractions", "Visit famous sites", "Try local cuisine"]]
+
+
+def get_activity_days(destination: str, mood: str) -> List[List[str]]:
+    """Return a fresh copy of the daily activity triples for a destination and mood"""
+    if destination in ACTIVITY_CATALOG:
+        days = ACTIVITY_CATALOG[destination].get(mood, [])
+    else:
+        days = GENERIC_ACTIVITIES.get(mood, DEFAULT_ACTIVITIES)
+    return [list(day) for day in days]
+
+
+class Activity:
+    """Catalog entry with per-person cost in Indian Rupees, duration, mood fit (0-10) and site
+
+    ``east_km``/``north_km`` place the site relative to the usual base in the
+    destination, ``opens``/``closes`` are hours of the day (values past 24 run
+    into the night).
+    """
+
+    __slots__ = ("name", "cost", "hours", "mood_scores", "east_km", "north_km", "opens", "closes")
+
+    def __init__(self, name: str, cost: int, hours: float, adventurous: int, fun: int, peaceful: int,
+                 east_km: float = 0.0, north_km: float = 0.0, opens: float = 9.0, closes: float = 21.0):
+        self.name = name
+        self.cost = cost
+        self.hours = hours
+        self.mood_scores = {"adventurous": adventurous, "fun": fun, "peaceful": peaceful}
+        self.east_km = east_km
+        self.north_km = north_km
+        self.opens = opens
+        self.closes = closes
+
+    def score(self, mood: str) -> int:
+        return self.mood_scores.get(mood, 5)
+
+
+# name: (cost, hours, adventurous, fun, peaceful)
+ACTIVITY_DETAILS = {
+    # Goa
+    "Water sports at Baga Beach": (2500, 3, 9, 7, 1),
+    "Scuba diving": (4500, 4, 10, 5, 2),
+    "Jet skiing": (1200, 1, 8, 7, 0),
+    "Dudhsagar Falls trek": (3000, 6, 9, 4, 5),
+    "Spice plantation tour": (800, 3, 4, 5, 6),
+    "Kayaking": (1000, 2, 7, 5, 5),
+    "Parasailing": (1500, 1, 9, 7, 0),
+    "Dolphin spotting cruise": (600, 2, 5, 6, 6),
+    "Beach volleyball": (0, 2, 5, 8, 2),
+    "Beach hopping": (300, 4, 4, 8, 5),
+    "Flea market shopping": (1000, 3, 1, 8, 3),
+    "Beach parties": (2000, 4, 3, 10, 0),
+    "Casino cruise": (3500, 4, 2, 9, 0),
+    "Nightlife in Tito's": (2500, 4, 2, 10, 0),
+    "Live music venues": (1200, 3, 1, 9, 3),
+    "Food tours": (1500, 3, 2, 8, 4),
+    "Local bars": (1000, 3, 1, 8, 1),
+    "Cultural shows": (700, 2, 1, 8, 5),
+    "Sunrise meditation on beach": (0, 1, 0, 2, 10),
+    "Ayurvedic spa": (3000, 2, 0, 3, 10),
+    "Quiet beach walks": (0, 2, 1, 3, 9),
+    "Old Goa churches": (200, 3, 1, 5, 8),
+    "Peaceful backwaters": (1200, 3, 2, 3, 9),
+    "Yoga sessions": (800, 2, 1, 2, 9),
+    "Sunset watching": (0, 1, 1, 5, 9),
+    "Reading by the beach": (0, 2, 0, 2, 9),
+    "Nature photography": (0, 3, 3, 4, 8),
+    # Manali
+    "Rohtang Pass adventure": (3500, 7, 10, 6, 4),
+    "River rafting": (1500, 3, 9, 7, 1),
+    "Paragliding": (3000, 2, 10, 7, 1),
+    "Solang Valley skiing": (2500, 4, 9, 7, 1),
+    "Mountain biking": (1200, 4, 8, 5, 3),
+    "Rock climbing": (1000, 3, 9, 4, 1),
+    "Trekking to Bhrigu Lake": (2000, 8, 10, 3, 6),
+    "Adventure sports": (2000, 3, 9, 6, 0),
+    "Camping": (1800, 6, 8, 6, 6),
+    "Mall Road shopping": (1000, 3, 0, 8, 3),
+    "Local cafes": (600, 2, 0, 7, 6),
+    "Cultural programs": (500, 2, 1, 7, 5),
+    "Apple orchard visits": (300, 2, 2, 6, 7),
+    "Local festivals": (300, 3, 3, 9, 3),
+    "Mountain railways": (800, 4, 3, 7, 6),
+    "Photography tours": (1000, 3, 4, 6, 6),
+    "Local markets": (500, 2, 1, 7, 3),
+    "Folk performances": (500, 2, 1, 8, 4),
+    "Hidimba Temple visit": (0, 2, 1, 3, 9),
+    "Nature walks": (0, 2, 3, 3, 9),
+    "Mountain meditation": (0, 2, 0, 1, 10),
+    "Hot springs relaxation": (300, 2, 1, 4, 9),
+    "Quiet mountain views": (0, 2, 1, 2, 9),
+    "Bird watching": (0, 3, 2, 2, 9),
+    "Peaceful forest walks": (0, 2, 2, 2, 10),
+    "Sunset points": (0, 1, 1, 5, 9),
+    "Reading in nature": (0, 2, 0, 1, 9),
+    # Rajasthan
+    "Desert safari": (2500, 4, 9, 8, 3),
+    "Camel riding": (800, 2, 7, 7, 3),
+    "Dune bashing": (2000, 2, 10, 8, 0),
+    "Fort exploration": (600, 3, 6, 6, 6),
+    "Heritage walks": (500, 3, 4, 5, 7),
+    "Desert camping": (3500, 8, 8, 8, 6),
+    "Hot air ballooning": (9000, 3, 9, 8, 6),
+    "Wildlife safari": (3000, 4, 8, 6, 6),
+    "Adventure tours": (2500, 4, 9, 6, 1),
+    "Folk dance": (500, 2, 1, 9, 4),
+    "Royal dining": (4000, 2, 0, 8, 5),
+    "Colorful markets": (800, 3, 1, 8, 3),
+    "Handicraft shopping": (1500, 2, 0, 7, 4),
+    "Palace tours": (700, 3, 2, 7, 7),
+    "Festival celebrations": (500, 4, 3, 10, 2),
+    "Traditional cuisine": (1200, 2, 1, 8, 5),
+    "Local entertainment": (800, 3, 2, 8, 2),
+    "Palace gardens": (200, 2, 0, 4, 9),
+    "Quiet temples": (0, 2, 0, 2, 9),
+    "Lakeside meditation": (0, 1, 0, 1, 10),
+    "Sunrise palace views": (300, 1, 1, 4, 9),
+    "Peaceful courtyards": (200, 2, 0, 2, 9),
+    "Garden walks": (100, 2, 1, 3, 9),
+    "Traditional art viewing": (400, 2, 0, 4, 8),
+    "Quiet museums": (300, 2, 0, 4, 8),
+    "Spiritual sites": (0, 2, 1, 2, 9),
+    # Generic
+    "Local adventure sports": (2000, 3, 9, 6, 1),
+    "Outdoor activities": (1000, 3, 8, 6, 4),
+    "Hiking trails": (300, 4, 8, 3, 6),
+    "Cultural exploration": (500, 3, 5, 6, 6),
+    "Local tours": (1000, 4, 5, 6, 5),
+    "Adventure experiences": (2500, 3, 9, 6, 1),
+    "Nature activities": (500, 3, 7, 4, 7),
+    "Exciting experiences": (2000, 3, 8, 7, 1),
+    "Local adventures": (1500, 4, 8, 5, 3),
+    "Shopping": (1500, 3, 0, 8, 2),
+    "Social activities": (800, 3, 2, 9, 2),
+    "Nightlife exploration": (2000, 4, 2, 10, 0),
+    "Local experiences": (800, 3, 3, 7, 5),
+    "Entertainment venues": (1200, 3, 1, 9, 1),
+    "Quiet places": (0, 2, 0, 1, 9),
+    "Meditation spots": (0, 1, 0, 1, 10),
+    "Peaceful attractions": (300, 2, 1, 3, 9),
+    "Serene locations": (200, 2, 2, 2, 9),
+    "Relaxation": (500, 2, 0, 3, 9),
+    "Calm experiences": (300, 2, 0, 2, 9),
+    "Quiet exploration": (0, 2, 2, 2, 8),
+    "Explore local attractions": (500, 3, 5, 6, 6),
+    "Visit famous sites": (500, 3, 4, 6, 6),
+    "Try local cuisine": (800, 2, 2, 8, 5)
+}
+
+# name: (km east of base, km north of base, opens, closes)
+ACTIVITY_SITES = {
+    # Goa, based in Panaji
+    "Water sports at Baga Beach": (-2, 14, 9, 17.5),
+    "Scuba diving": (-8, -8, 8, 15),
+    "Jet skiing": (-2, 14, 9, 17.5),
+    "Dudhsagar Falls trek": (45, -25, 7, 17),
+    "Spice plantation tour": (22, -8, 9, 16),
+    "Kayaking": (2, 18, 7, 18),
+    "Parasailing": (-1, 13, 9, 17.5),
+    "Dolphin spotting cruise": (0, 1, 8, 12),
+    "Beach volleyball": (-2, 14, 7, 19),
+    "Beach hopping": (-1, 12, 8, 19),
+    "Flea market shopping": (0, 16, 8, 18),
+    "Beach parties": (1, 18, 20, 26),
+    "Casino cruise": (0, 0.5, 18, 26),
+    "Nightlife in Tito's": (-2, 14, 21, 27),
+    "Live music venues": (-1, 15, 19, 25),
+    "Food tours": (0, 0, 11, 22),
+    "Local bars": (-2, 14, 17, 25),
+    "Cultural shows": (0, 0, 18, 22),
+    "Sunrise meditation on beach": (-3, 2, 5.5, 7.5),
+    "Ayurvedic spa": (-2, 10, 9, 20),
+    "Quiet beach walks": (-2, 1, 6, 19),
+    "Old Goa churches": (9, 1, 9, 17.5),
+    "Peaceful backwaters": (10, -3, 8, 17),
+    "Yoga sessions": (-3, 12, 6.5, 10),
+    "Sunset watching": (-2, 2, 17.5, 19),
+    "Reading by the beach": (-3, 3, 8, 18),
+    "Nature photography": (6, 8, 6, 18),
+    # Manali, based at Mall Road
+    "Rohtang Pass adventure": (5, 30, 6, 17),
+    "River rafting": (-3, -12, 9, 16),
+    "Paragliding": (3, 13, 9, 16),
+    "Solang Valley skiing": (3, 13, 9, 16),
+    "Mountain biking": (2, 5, 8, 17),
+    "Rock climbing": (3, 12, 9, 16),
+    "Trekking to Bhrigu Lake": (5, 18, 6, 17),
+    "Adventure sports": (3, 13, 9, 17),
+    "Camping": (2, 10, 15, 23),
+    "Mall Road shopping": (0, 0, 10, 21),
+    "Local cafes": (-1, 2, 9, 23),
+    "Cultural programs": (0, 0, 18, 22),
+    "Apple orchard visits": (-2, 4, 9, 17),
+    "Local festivals": (0, 1, 10, 22),
+    "Mountain railways": (0, -5, 9, 17),
+    "Photography tours": (1, 6, 6, 18),
+    "Local markets": (0, 0.5, 9, 21),
+    "Folk performances": (0, 0, 18, 22),
+    "Hidimba Temple visit": (-1.5, 1.5, 8, 18),
+    "Nature walks": (-1, 2, 6, 18),
+    "Mountain meditation": (-1, 3, 5.5, 9),
+    "Hot springs relaxation": (1, 3, 7, 21),
+    "Quiet mountain views": (0, 4, 6, 19),
+    "Bird watching": (-2, 3, 6, 10),
+    "Peaceful forest walks": (-1, 1, 7, 18),
+    "Sunset points": (-1, 3, 17, 19.5),
+    "Reading in nature": (-1, 2, 8, 18),
+    # Rajasthan, based in Jaipur
+    "Desert safari": (-25, -5, 15, 20),
+    "Camel riding": (-25, -5, 7, 19),
+    "Dune bashing": (-25, -5, 15, 19),
+    "Fort exploration": (2, 10, 8, 17.5),
+    "Heritage walks": (0, 1, 7, 11),
+    "Desert camping": (-25, -5, 16, 26),
+    "Hot air ballooning": (3, 12, 6, 10),
+    "Wildlife safari": (10, 5, 6, 18),
+    "Adventure tours": (5, 10, 8, 18),
+    "Folk dance": (-3, -12, 19, 22.5),
+    "Royal dining": (0, 2, 19, 23),
+    "Colorful markets": (0, 1, 10, 21),
+    "Handicraft shopping": (0, 1, 10, 20),
+    "Palace tours": (0, 1.5, 9.5, 17),
+    "Festival celebrations": (0, 1, 10, 22),
+    "Traditional cuisine": (-3, -12, 12, 23),
+    "Local entertainment": (0, 0, 18, 23),
+    "Palace gardens": (1, 3, 8, 18),
+    "Quiet temples": (4, 2, 6, 12),
+    "Lakeside meditation": (2, 6, 6, 8),
+    "Sunrise palace views": (2, 8, 6, 7.5),
+    "Peaceful courtyards": (0, 1.5, 9.5, 17),
+    "Garden walks": (1, 3, 7, 18),
+    "Traditional art viewing": (0, 1, 10, 18),
+    "Quiet museums": (-1, 0, 9, 17),
+    "Spiritual sites": (4, 2, 6, 20),
+    # Generic, typical distances from a city-centre base
+    "Local adventure sports": (6, 8, 9, 17),
+    "Outdoor activities": (5, 6, 8, 18),
+    "Hiking trails": (8, 10, 6, 16),
+    "Cultural exploration": (0, 1, 9, 18),
+    "Local tours": (1, 2, 9, 18),
+    "Adventure experiences": (6, 8, 9, 17),
+    "Nature activities": (5, 6, 7, 17),
+    "Exciting experiences": (4, 5, 10, 20),
+    "Local adventures": (6, 7, 8, 17),
+    "Shopping": (0, 0.5, 10, 21),
+    "Social activities": (0, 1, 10, 22),
+    "Nightlife exploration": (1, 1, 20, 26),
+    "Local experiences": (0, 1, 9, 20),
+    "Entertainment venues": (1, 1, 17, 24),
+    "Quiet places": (-3, 2, 6, 19),
+    "Meditation spots": (-3, 3, 5.5, 9),
+    "Peaceful attractions": (-2, 2, 8, 18),
+    "Serene locations": (-4, 4, 6, 18),
+    "Relaxation": (0, 1, 9, 21),
+    "Calm experiences": (-2, 2, 7, 19),
+    "Quiet exploration": (-2, 3, 7, 18),
+    "Explore local attractions": (1, 2, 9, 18),
+    "Visit famous sites": (1, 1, 9, 18),
+    "Try local cuisine": (0, 0, 12, 23)
+}
+
+ACTIVITIES = {
+    name: Activity(name, *details, *ACTIVITY_SITES.get(name, ()))
+    for name, details in ACTIVITY_DETAILS.items()
+}
+
+
+def get_candidate_activities(destination: str) -> List[Activity]:
+    """Every catalog activity available at a destination, across all moods"""
+    if destination in ACTIVITY_CATALOG:
+        groups = ACTIVITY_CATALOG[destination].values()
+    else:
+        groups = list(GENERIC_ACTIVITIES.values()) + [DEFAULT_ACTIVITIES]
+
+    names = dict.fromkeys(name for days in groups for day in days for name in day)
+    return [ACTIVITIES[name] for name in names]
+
+
+def activity_cost(name: str) -> int:
+    """Per-person cost of a catalog activity, 0 for names outside the catalog"""
+    activity = ACTIVITIES.get(name)
+    return activity.cost if activity is not None else 0
+
+
+# Trip options offered in the app and accepted by the HTTP service
+MOODS = ("adventurous", "fun", "peaceful")
+BUDGETS = ("budget", "mid-range", "luxury")
+TRANSPORT_MODES = ("flight", "train", "bus", "car", "bike")
+LANGUAGES = ("en", "hi", "bn", "ta", "te", "gu", "kn", "mr", "pa", "ml")
+
+# Destinations offered in the app
+DESTINATIONS = [
+    "Goa", "Manali", "Shimla", "Jaipur", "Udaipur", "Rishikesh", "Darjeeling",
+    "Ooty", "Agra", "Varanasi", "Amritsar", "Kerala", "Munnar", "Hampi",
+    "Ladakh", "Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata"
+]
+
+# name: (latitude, longitude, cost level 1-3, adventurous, fun, peaceful, description)
+DESTINATION_INFO = {
+    "Goa": (15.50, 73.83, 2, 6, 10, 6, "beaches, nightlife, beach parties, water sports, seafood, casinos, portuguese heritage, old churches, sunsets"),
+    "Manali": (32.24, 77.19, 2, 9, 6, 7, "snow-capped himalayan mountains, trekking, paragliding, river rafting, skiing, apple orchards, old temples"),
+    "Shimla": (31.10, 77.17, 2, 4, 5, 9, "colonial hill station charm, mall road, the toy train, pine forests, mountain views, cool weather walks"),
+    "Jaipur": (26.91, 75.79, 2, 4, 8, 5, "pink city forts and palaces, heritage bazaars, handicrafts, rajasthani cuisine, royal culture"),
+    "Udaipur": (24.59, 73.71, 3, 3, 6, 9, "lakes and palaces, romantic boat rides, sunsets, heritage havelis, serene rajasthan evenings"),
+    "Rishikesh": (30.09, 78.27, 1, 10, 5, 8, "river rafting, bungee jumping, riverside camping, the ganga, yoga, meditation ashrams, spiritual trekking"),
+    "Darjeeling": (27.04, 88.26, 2, 4, 4, 10, "tea gardens, himalayan views of kanchenjunga, the toy train, monasteries, misty calm hills"),
+    "Ooty": (11.41, 76.70, 2, 3, 4, 10, "nilgiri hills, tea estates, lakes, botanical gardens, the toy train, cool quiet weather"),
+    "Agra": (27.18, 78.01, 2, 2, 6, 5, "the taj mahal, mughal monuments and forts, history, architecture, petha markets"),
+    "Varanasi": (25.32, 82.97, 1, 3, 6, 8, "ganga ghats, evening aarti, ancient temples, spiritual boat rides, silk weaving, meditation"),
+    "Amritsar": (31.63, 74.87, 1, 2, 6, 8, "the golden temple, langar, punjabi food, the wagah border ceremony, history, busy markets"),
+    "Kerala": (10.85, 76.27, 2, 5, 5, 10, "backwaters, houseboats, ayurveda, beaches, coconut palms, spice plantations, wildlife, serene villages"),
+    "Munnar": (10.09, 77.06, 2, 6, 4, 10, "tea plantations, misty hills, waterfalls, trekking, wildlife, viewpoints, calm nature"),
+    "Hampi": (15.34, 76.46, 1, 7, 5, 7, "ancient ruins and temples, boulder landscapes, bouldering, cycling, heritage, sunsets, coracle rides"),
+    "Ladakh": (34.15, 77.58, 3, 10, 5, 7, "high altitude mountain passes, bike expeditions, monasteries, pangong lake, trekking, desert camping"),
+    "Mumbai": (19.08, 72.88, 3, 3, 10, 3, "city nightlife, bollywood, street food, marine drive, shopping, cafes, beaches, museums"),
+    "Delhi": (28.61, 77.21, 2, 3, 9, 4, "capital monuments, markets, street food, nightlife, museums, mughal heritage, shopping"),
+    "Bangalore": (12.97, 77.59, 2, 4, 9, 5, "pubs and breweries, cafes, gardens, nightlife, shopping, live music, parks"),
+    "Chennai": (13.08, 80.27, 2, 3, 6, 6, "marina beach, temples, south indian food, classical music, culture, heritage"),
+    "Kolkata": (22.57, 88.36, 1, 2, 8, 6, "culture and literature, durga puja festivals, sweets, colonial heritage, trams, museums")
+}
@@ -0,0 +1,51 @@
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class Deadline:
+    """Time budget of one request, shared by every planning stage
+
+    Stages ask ``timeout(cap)`` for how long they may block, check ``expired``
+    before starting optional work and wrap themselves in ``stage(name)`` so the
+    response can report where the time went. ``reserve`` gives an earlier
+    deadline for one stage so later ones keep some time of their own.
+    """
+
+    __slots__ = ("expires_at", "timings", "started_at")
+
+    def __init__(self, seconds: Optional[float] = None, timings: Optional[Dict[str, float]] = None,
+                 expires_at: Optional[float] = None):
+        self.started_at = time.monotonic()
+        if expires_at is None:
+            expires_at = self.started_at + seconds if seconds else math.inf
+        self.expires_at = expires_at
+        self.timings = {} if timings is None else timings
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """How long a blocking call may take: ``cap`` or whatever is left, if less; None for no limit"""
+        limit = self.remaining() if cap is None else min(cap, self.remaining())
+        return None if math.isinf(limit) else limit
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """Deadline ``seconds`` earlier than this one, recording into the same timings"""
+        return Deadline(timings=self.timings, expires_at=self.expires_at - seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.monotonic()
+        try:
+            yield self
+        finally:
+            elapsed = (time.monotonic() - start) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed, 1)
+
+    def elapsed_ms(self) -> float:
+        return round((time.monotonic() - self.started_at) * 1000, 1)
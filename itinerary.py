@@ -0,0 +1,218 @@
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterable, Optional, Tuple
+
+from scheduler import format_time, time_slot
+
+# Bump when the layout produced by Itinerary.to_compact changes
+COMPACT_VERSION = 3
+# Older layouts from_compact still reads; version 1 days have no times,
+# versions 1 and 2 have no flags or stage timings
+READABLE_COMPACT_VERSIONS = (1, 2, 3)
+
+
+def _intern_all(values: Iterable[str]) -> Tuple[str, ...]:
+    """Intern strings so every itinerary shares one copy of each catalog activity"""
+    return tuple(sys.intern(value) for value in values)
+
+
+class CostBreakdown(Mapping):
+    """Trip costs in Indian Rupees, readable like the old cost_breakdown dict"""
+
+    __slots__ = ("transport", "accommodation", "food", "activities", "miscellaneous")
+    _keys = __slots__
+
+    def __init__(self, transport: int, accommodation: int, food: int, activities: int, miscellaneous: int):
+        self.transport = transport
+        self.accommodation = accommodation
+        self.food = food
+        self.activities = activities
+        self.miscellaneous = miscellaneous
+
+    @property
+    def total(self) -> int:
+        return self.transport + self.accommodation + self.food + self.activities + self.miscellaneous
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def to_compact(self) -> tuple:
+        return tuple(getattr(self, key) for key in self._keys)
+
+    @classmethod
+    def from_compact(cls, data: tuple) -> "CostBreakdown":
+        return cls(*data)
+
+
+class DayPlan(Mapping):
+    """One day of an itinerary, readable like the old daily_plan entries
+
+    ``times`` holds a (start, end) pair in minutes after midnight for each
+    activity, in visiting order, or is empty for unscheduled days.
+    """
+
+    __slots__ = ("day", "theme", "activities", "estimated_cost", "times")
+    _keys = ("day", "theme", "activities", "estimated_cost", "schedule")
+
+    def __init__(self, day: int, theme: str, activities: Iterable[str], estimated_cost: int,
+                 times: Iterable[Tuple[int, int]] = ()):
+        self.day = day
+        self.theme = sys.intern(theme)
+        self.activities = _intern_all(activities)
+        self.estimated_cost = estimated_cost
+        self.times = tuple(tuple(pair) for pair in times)
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key == "activities":
+            return list(self.activities)
+        if key == "schedule":
+            return [
+                {"activity": activity, "slot": time_slot(start), "start": format_time(start), "end": format_time(end)}
+                for activity, (start, end) in zip(self.activities, self.times)
+            ]
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def replace(self, theme: Optional[str] = None, activities: Optional[Iterable[str]] = None) -> "DayPlan":
+        return DayPlan(
+            self.day,
+            self.theme if theme is None else theme,
+            self.activities if activities is None else activities,
+            self.estimated_cost,
+            self.times
+        )
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self._keys}
+
+    def to_compact(self) -> tuple:
+        return (self.theme, self.activities, self.estimated_cost, self.times)
+
+    @classmethod
+    def from_compact(cls, day: int, data: tuple) -> "DayPlan":
+        return cls(day, *data)
+
+
+class Itinerary(Mapping):
+    """Slotted trip itinerary
+
+    Behaves like the read-only dict the planner used to return (``trip.get("daily_plan")``,
+    ``trip["cost_breakdown"]``...) so existing callers keep working, while holding
+    interned activity strings and a compact tuple form for session state and caches.
+
+    ``flags`` name the parts of a partial result, e.g. "fallback_reasoning" when
+    the model did not answer in time, and ``timings`` the milliseconds spent per
+    planning stage.
+    """
+
+    __slots__ = ("destination", "duration", "mood", "budget", "reasoning", "days",
+                 "costs", "user_city", "transport_mode", "cache_hit", "flags", "timings")
+    _keys = ("destination", "duration", "mood", "budget", "reasoning", "daily_plan",
+             "total_cost", "cost_breakdown", "transport_details", "cache_hit", "flags", "stage_timings_ms")
+
+    def __init__(self, destination: str, duration: int, mood: str, budget: str, reasoning: str,
+                 days: Iterable[DayPlan], costs: CostBreakdown, user_city: str, transport_mode: str,
+                 cache_hit: bool = False, flags: Iterable[str] = (), timings: Optional[Dict[str, float]] = None):
+        self.destination = sys.intern(destination)
+        self.duration = duration
+        self.mood = sys.intern(mood)
+        self.budget = sys.intern(budget)
+        self.reasoning = reasoning
+        self.days = tuple(days)
+        self.costs = costs
+        self.user_city = sys.intern(user_city)
+        self.transport_mode = sys.intern(transport_mode)
+        self.cache_hit = cache_hit
+        self.flags = _intern_all(flags)
+        self.timings = dict(timings) if timings else {}
+
+    @property
+    def total_cost(self) -> int:
+        return self.costs.total
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.flags)
+
+    def __getitem__(self, key):
+        if key == "daily_plan":
+            return list(self.days)
+        if key == "total_cost":
+            return self.total_cost
+        if key == "cost_breakdown":
+            return self.costs
+        if key == "flags":
+            return list(self.flags)
+        if key == "stage_timings_ms":
+            return dict(self.timings)
+        if key == "transport_details":
+            return {
+                "mode": self.transport_mode,
+                "cost": self.costs.transport,
+                "route": f"{self.user_city} to {self.destination}"
+            }
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def replace(self, reasoning: Optional[str] = None, days: Optional[Iterable[DayPlan]] = None,
+                flags: Optional[Iterable[str]] = None, timings: Optional[Dict[str, float]] = None) -> "Itinerary":
+        return Itinerary(
+            self.destination, self.duration, self.mood, self.budget,
+            self.reasoning if reasoning is None else reasoning,
+            self.days if days is None else days,
+            self.costs, self.user_city, self.transport_mode, self.cache_hit,
+            self.flags if flags is None else flags,
+            self.timings if timings is None else timings
+        )
+
+    def to_dict(self) -> Dict:
+        """Plain nested dict in the planner's historical format, e.g. for JSON responses"""
+        data = {key: self[key] for key in self._keys}
+        data["daily_plan"] = [day.to_dict() for day in self.days]
+        data["cost_breakdown"] = dict(self.costs)
+        return data
+
+    def to_compact(self) -> tuple:
+        """Flat tuple of primitives, the form kept in session state and caches"""
+        return (
+            COMPACT_VERSION, self.destination, self.duration, self.mood, self.budget,
+            self.reasoning, self.user_city, self.transport_mode, self.cache_hit,
+            self.costs.to_compact(), tuple(day.to_compact() for day in self.days),
+            self.flags, tuple(self.timings.items())
+        )
+
+    @classmethod
+    def from_compact(cls, data: tuple) -> "Itinerary":
+        version = data[0]
+        if version not in READABLE_COMPACT_VERSIONS:
+            raise ValueError(f"Unsupported compact itinerary version {version}")
+        destination, duration, mood, budget, reasoning, user_city, transport_mode, cache_hit, costs, days = data[1:11]
+        flags, timings = data[11:13] if version >= 3 else ((), ())
+        return cls(
+            destination, duration, mood, budget, reasoning,
+            (DayPlan.from_compact(i, day) for i, day in enumerate(days, 1)),
+            CostBreakdown.from_compact(costs), user_city, transport_mode, cache_hit,
+            flags, dict(timings)
+        )
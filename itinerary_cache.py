@@ -0,0 +1,169 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, List, Optional
+
+
+class SimilarityPolicy:
+    """Decides whether a stored itinerary is close enough to be reused for a new request"""
+
+    def __init__(self, duration_window: int = 2, allow_different_origin: bool = True,
+                 require_same_transport: bool = True, max_age_seconds: int = 7 * 24 * 3600):
+        self.duration_window = duration_window
+        self.allow_different_origin = allow_different_origin
+        self.require_same_transport = require_same_transport
+        self.max_age_seconds = max_age_seconds
+
+    def is_match(self, entry: Dict, user_city: str, duration: int, transport_mode: str) -> bool:
+        """Check a stored entry (already matching destination, mood and budget) against the request"""
+        if abs(entry["duration"] - duration) > self.duration_window:
+            return False
+        if not self.allow_different_origin and entry["user_city"] != user_city:
+            return False
+        if self.require_same_transport and entry["transport_mode"] != transport_mode:
+            return False
+        if self.max_age_seconds and time.time() - entry["created_at"] > self.max_age_seconds:
+            return False
+        return True
+
+    def rank(self, entry: Dict, user_city: str, duration: int, transport_mode: str) -> tuple:
+        """Sort key for candidate entries, lower is closer"""
+        return (
+            entry["user_city"] != user_city,
+            abs(entry["duration"] - duration),
+            entry["transport_mode"] != transport_mode,
+            -entry["created_at"]
+        )
+
+
+class ItineraryCache:
+    """Persistent itinerary store indexed by (destination, mood, budget)
+
+    Entries keep the LLM reasoning and the daily activities of a generated trip.
+    A close match (different origin, nearby duration) is reused and only the
+    route- and duration-dependent parts are recomputed by the planner. The
+    reasoning names the transport mode, so by default only entries for the same
+    mode match.
+    """
+
+    def __init__(self, path: Optional[str] = None, policy: Optional[SimilarityPolicy] = None,
+                 max_entries_per_key: int = 20):
+        self.path = path or os.getenv("ITINERARY_CACHE_PATH", "itinerary_cache.sqlite3")
+        self.policy = policy or SimilarityPolicy(
+            duration_window=int(os.getenv("ITINERARY_CACHE_DURATION_WINDOW", "2"))
+        )
+        self.max_entries_per_key = max_entries_per_key
+        self._create_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        """New connection; callers close it, ``with conn`` alone only ends the transaction"""
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _create_tables(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS itineraries (
+                destination TEXT NOT NULL,
+                mood TEXT NOT NULL,
+                budget TEXT NOT NULL,
+                user_city TEXT NOT NULL,
+                duration INTEGER NOT NULL,
+                transport_mode TEXT NOT NULL,
+                reasoning TEXT NOT NULL,
+                activities TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )""")
+            conn.execute("""CREATE INDEX IF NOT EXISTS idx_itineraries_key
+                ON itineraries (destination, mood, budget)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )""")
+
+    def _bump(self, conn: sqlite3.Connection, name: str):
+        conn.execute(
+            "INSERT INTO cache_stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def lookup(self, destination: str, mood: str, budget: str, user_city: str, duration: int, transport_mode: str) -> Optional[Dict]:
+        """Return the closest reusable entry for the request, or None"""
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                "SELECT user_city, duration, transport_mode, reasoning, activities, created_at "
+                "FROM itineraries WHERE destination = ? AND mood = ? AND budget = ?",
+                (destination, mood, budget)
+            ).fetchall()
+
+            candidates = []
+            for row in rows:
+                entry = {
+                    "user_city": row[0],
+                    "duration": row[1],
+                    "transport_mode": row[2],
+                    "reasoning": row[3],
+                    "activities": json.loads(row[4]),
+                    "created_at": row[5]
+                }
+                if self.policy.is_match(entry, user_city, duration, transport_mode):
+                    candidates.append(entry)
+
+            if not candidates:
+                self._bump(conn, "misses")
+                return None
+
+            best = min(candidates, key=lambda e: self.policy.rank(e, user_city, duration, transport_mode))
+            exact = best["user_city"] == user_city and best["duration"] == duration
+            self._bump(conn, "hits")
+            self._bump(conn, "exact_hits" if exact else "approximate_hits")
+
+        best["reasoning"] = adapt_reasoning(best["reasoning"], best["user_city"], user_city, best["duration"], duration)
+        return best
+
+    def store(self, destination: str, mood: str, budget: str, user_city: str, duration: int,
+              transport_mode: str, reasoning: str, activities: List[List[str]]):
+        """Store a freshly generated itinerary, keeping only the newest entries per key"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO itineraries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (destination, mood, budget, user_city, duration, transport_mode,
+                 reasoning, json.dumps(activities), time.time())
+            )
+            conn.execute(
+                "DELETE FROM itineraries WHERE destination = ? AND mood = ? AND budget = ? AND rowid NOT IN ("
+                "SELECT rowid FROM itineraries WHERE destination = ? AND mood = ? AND budget = ? "
+                "ORDER BY created_at DESC LIMIT ?)",
+                (destination, mood, budget, destination, mood, budget, self.max_entries_per_key)
+            )
+            self._bump(conn, "stores")
+
+    def stats(self) -> Dict:
+        """Hit-rate metrics accumulated across all planners sharing this store"""
+        with closing(self._connect()) as conn, conn:
+            counters = dict(conn.execute("SELECT name, value FROM cache_stats").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM itineraries").fetchone()[0]
+
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "exact_hits": counters.get("exact_hits", 0),
+            "approximate_hits": counters.get("approximate_hits", 0),
+            "stores": counters.get("stores", 0),
+            "entries": entries,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+
+def adapt_reasoning(reasoning: str, old_city: str, new_city: str, old_duration: int, new_duration: int) -> str:
+    """Rewrite origin and trip length mentions in stored reasoning for the new request"""
+    if old_city != new_city:
+        reasoning = re.sub(rf"\b{re.escape(old_city)}\b", new_city, reasoning)
+    if old_duration != new_duration:
+        reasoning = re.sub(rf"\b{old_duration}(-|\s)day", rf"{new_duration}\1day", reasoning)
+    return reasoning
@@ -0,0 +1,149 @@
+import math
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from catalog import DESTINATION_INFO, MOODS, get_candidate_activities
+
+BUDGET_LEVELS = {"budget": 1, "mid-range": 2, "luxury": 3}
+
+# Longest one-way distance (km) considered practical per transport mode
+MAX_DISTANCE_KM = {
+    "flight": math.inf,
+    "train": 3000,
+    "bus": 1500,
+    "car": 1500,
+    "bike": 1000
+}
+
+# Weights of the score components
+MOOD_WEIGHT = 1.0
+KEYWORD_WEIGHT = 3.0
+BUDGET_WEIGHT = 0.3
+DISTANCE_WEIGHT = 0.2
+# Subtracted when a keyword query matches nothing about a destination; more than the other
+# components can add up to, so every destination matching the query ranks above those that do not
+KEYWORD_MISS_PENALTY = 10.0
+
+_TOKEN = re.compile(r"[a-z]+")
+
+
+def _normalize(token: str) -> str:
+    """Strip English plural endings, so "beaches" matches "beach" and "cities" matches "city"."""
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")) and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+def _tokenize(text: str) -> List[str]:
+    return [_normalize(token) for token in _TOKEN.findall(text.lower()) if len(token) > 2]
+
+
+class DestinationRecommender:
+    """Ranks destinations for a mood, budget, keywords and origin with a few NumPy operations
+
+    Everything that does not depend on the query is built once: a TF-IDF matrix
+    over each destination's description and catalog activities, mood affinities,
+    cost levels and the pairwise distance matrix.
+    """
+
+    def __init__(self, destination_info: Optional[Dict] = None):
+        info = destination_info or DESTINATION_INFO
+        self.destinations = list(info)
+        self.index = {name: i for i, name in enumerate(self.destinations)}
+
+        documents = []
+        for name, (_, _, _, _, _, _, description) in info.items():
+            activity_text = " ".join(activity.name for activity in get_candidate_activities(name))
+            documents.append(_tokenize(f"{name} {description} {activity_text}"))
+
+        self.vocabulary = {token: i for i, token in enumerate(sorted({t for doc in documents for t in doc}))}
+        counts = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        for row, doc in enumerate(documents):
+            for token in doc:
+                counts[row, self.vocabulary[token]] += 1
+
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        tfidf = counts * self.idf
+        self.tfidf = tfidf / np.linalg.norm(tfidf, axis=1, keepdims=True)
+
+        values = np.array([row[:6] for row in info.values()], dtype=np.float32)
+        self.cost_levels = values[:, 2]
+        self.mood_scores = values[:, 3:6] / 10.0
+
+        latitudes, longitudes = np.radians(values[:, 0]), np.radians(values[:, 1])
+        self.distances = self._haversine(latitudes, longitudes)
+        self.max_distance = float(self.distances.max())
+
+    @staticmethod
+    def _haversine(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        d_lat = latitudes[:, None] - latitudes[None, :]
+        d_lon = longitudes[:, None] - longitudes[None, :]
+        a = np.sin(d_lat / 2) ** 2 + np.cos(latitudes)[:, None] * np.cos(latitudes)[None, :] * np.sin(d_lon / 2) ** 2
+        return (2 * 6371.0 * np.arcsin(np.sqrt(a))).astype(np.float32)
+
+    def _keyword_vector(self, keywords: str) -> Optional[np.ndarray]:
+        indices = [self.vocabulary[token] for token in _tokenize(keywords) if token in self.vocabulary]
+        if not indices:
+            return None
+        query = np.zeros(len(self.vocabulary), dtype=np.float32)
+        np.add.at(query, indices, 1.0)
+        query *= self.idf
+        return query / np.linalg.norm(query)
+
+    def recommend(self, mood: Optional[str] = None, budget: Optional[str] = None, keywords: str = "",
+                  origin: Optional[str] = None, transport_mode: Optional[str] = None, top_k: int = 3) -> List[Dict]:
+        """Best destinations for the query, each with its score and distance from the origin"""
+        scores = np.zeros(len(self.destinations), dtype=np.float32)
+
+        if mood in MOODS:
+            scores += MOOD_WEIGHT * self.mood_scores[:, MOODS.index(mood)]
+
+        query = self._keyword_vector(keywords) if keywords else None
+        if query is not None:
+            similarity = self.tfidf @ query
+            scores += KEYWORD_WEIGHT * similarity
+            scores[similarity <= 0] -= KEYWORD_MISS_PENALTY
+
+        if budget in BUDGET_LEVELS:
+            # Penalise destinations that cost more than the budget level allows
+            overshoot = np.maximum(self.cost_levels - BUDGET_LEVELS[budget], 0)
+            scores -= BUDGET_WEIGHT * overshoot
+
+        distances = None
+        if origin in self.index:
+            distances = self.distances[self.index[origin]]
+            scores -= DISTANCE_WEIGHT * distances / self.max_distance
+            scores[self.index[origin]] = -np.inf
+            if transport_mode in MAX_DISTANCE_KM:
+                scores[distances > MAX_DISTANCE_KM[transport_mode]] = -np.inf
+
+        top_k = min(top_k, int(np.isfinite(scores).sum()))
+        best = np.argpartition(-scores, top_k - 1)[:top_k] if top_k else np.array([], dtype=int)
+        best = best[np.argsort(-scores[best])]
+
+        return [
+            {
+                "destination": self.destinations[i],
+                "score": round(float(scores[i]), 3),
+                "distance_km": round(float(distances[i])) if distances is not None else None
+            }
+            for i in best
+        ]
+
+
+_recommender = None
+
+
+def get_recommender() -> DestinationRecommender:
+    """Process-wide recommender, built on first use"""
+    global _recommender
+    if _recommender is None:
+        _recommender = DestinationRecommender()
+    return _recommender
@@ -0,0 +1,113 @@
+import itertools
+import math
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+from catalog import ACTIVITIES, Activity
+
+# Getting around a destination: straight-line km to road km, average speed and
+# a fixed overhead per transfer for parking, tickets and finding the entrance
+ROAD_FACTOR = 1.3
+CITY_SPEED_KMH = 25
+TRANSFER_MINUTES = 15
+
+# Earliest time to leave the base, in minutes after midnight
+DAY_START = 5 * 60
+# Days with up to this many activities try every order, longer ones are ordered greedily
+EXACT_LIMIT = 6
+
+SLOTS = (("Morning", 12 * 60), ("Afternoon", 17 * 60), ("Evening", math.inf))
+
+
+def time_slot(start: int) -> str:
+    """Part of the day an activity starting at ``start`` minutes after midnight falls in"""
+    for name, before in SLOTS:
+        if start < before:
+            return name
+    return SLOTS[-1][0]
+
+
+def format_time(minutes: int) -> str:
+    """Minutes after midnight as HH:MM, wrapping activities that run past midnight"""
+    hours, minutes = divmod(int(minutes) % (24 * 60), 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def travel_minutes(origin: Optional[Activity], destination: Optional[Activity]) -> int:
+    """Minutes to get between two sites; None is the base"""
+    x1, y1 = (origin.east_km, origin.north_km) if origin is not None else (0.0, 0.0)
+    x2, y2 = (destination.east_km, destination.north_km) if destination is not None else (0.0, 0.0)
+    km = math.hypot(x2 - x1, y2 - y1) * ROAD_FACTOR
+    return round(TRANSFER_MINUTES + km / CITY_SPEED_KMH * 60)
+
+
+class DaySchedule:
+    """Activities of one day in visiting order with (start, end) minutes after midnight"""
+
+    __slots__ = ("activities", "times", "travel_minutes", "feasible")
+
+    def __init__(self, activities: Tuple[str, ...], times: Tuple[Tuple[int, int], ...], travel_minutes: int, feasible: bool):
+        self.activities = activities
+        self.times = times
+        self.travel_minutes = travel_minutes
+        self.feasible = feasible
+
+    @property
+    def busy_minutes(self) -> int:
+        """Time out of the base: activities plus travel"""
+        return sum(end - start for start, end in self.times) + self.travel_minutes
+
+
+def _activity(name: str) -> Activity:
+    """Catalog entry for a name, or a two-hour daytime activity at the base for unknown names"""
+    activity = ACTIVITIES.get(name)
+    return activity if activity is not None else Activity(name, 0, 2, 5, 5, 5)
+
+
+def _timeline(order: Tuple[Activity, ...]) -> Tuple[int, int, int, Tuple[Tuple[int, int], ...]]:
+    """Walk the day in the given order: (minutes past closing, travel minutes, end, times)"""
+    clock, here = DAY_START, None
+    overrun = travel = 0
+    times = []
+    for activity in order:
+        leg = travel_minutes(here, activity)
+        travel += leg
+        start = max(clock + leg, round(activity.opens * 60))
+        end = start + round(activity.hours * 60)
+        overrun += max(0, end - round(activity.closes * 60))
+        times.append((start, end))
+        clock, here = end, activity
+    if order:
+        travel += travel_minutes(here, None)
+    return overrun, travel, clock, tuple(times)
+
+
+@lru_cache(maxsize=8192)
+def _schedule(names: Tuple[str, ...]) -> DaySchedule:
+    activities = tuple(_activity(name) for name in names)
+    if len(activities) <= EXACT_LIMIT:
+        orders = itertools.permutations(activities)
+    else:
+        orders = [tuple(sorted(activities, key=lambda a: (a.opens, a.closes)))]
+
+    best_key, best_order, best_times = None, (), ()
+    for order in orders:
+        overrun, travel, end, times = _timeline(order)
+        key = (overrun, travel, end)
+        if best_key is None or key < best_key:
+            best_key, best_order, best_times = key, order, times
+
+    overrun, travel = best_key[:2] if best_key is not None else (0, 0)
+    return DaySchedule(tuple(a.name for a in best_order), best_times, travel, overrun == 0)
+
+
+def schedule_day(names: Iterable[str]) -> DaySchedule:
+    """Order a day's activities to respect opening hours with the least travel
+
+    Every order is tried for the usual three activities a day, which takes
+    microseconds; results are memoised by the set of activities, so the
+    activity solver can probe many combinations cheaply. If no order fits all
+    opening windows, the one with the least time past closing is returned and
+    ``feasible`` is False.
+    """
+    return _schedule(tuple(sorted(names)))
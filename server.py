@@ -0,0 +1,231 @@
+"""Headless JSON HTTP service exposing TripPlanner
+
+Run with ``python server.py`` and POST trip parameters to ``/v1/itinerary``:
+
+    curl -X POST localhost:8080/v1/itinerary -d '{"mood": "fun", "budget": "budget",
+        "duration": 5, "user_city": "Mumbai", "destination_city": "Goa", "transport_mode": "train"}'
+
+``/healthz`` reports that the process is up, ``/readyz`` that the planner is
+initialised and there is capacity for another trip.
+"""
+import argparse
+import asyncio
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from catalog import BUDGETS, LANGUAGES, MOODS, TRANSPORT_MODES
+from deadline import Deadline
+from itinerary import Itinerary
+from trip_planner import TripPlanner
+
+MAX_BODY_BYTES = 64 * 1024
+# The planner stops at the request deadline; this is only a backstop past it
+DEADLINE_GRACE_SECONDS = 2.0
+
+REQUIRED_FIELDS = {
+    "mood": str,
+    "budget": str,
+    "duration": int,
+    "user_city": str,
+    "destination_city": str,
+    "transport_mode": str
+}
+
+# Allowed values, the same options the app offers
+CHOICES = {
+    "mood": MOODS,
+    "budget": BUDGETS,
+    "transport_mode": TRANSPORT_MODES,
+    "language": LANGUAGES
+}
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout"
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TripService:
+    """Serves itineraries over HTTP/1.1 with bounded concurrency and per-request timeouts"""
+
+    def __init__(self, planner: Optional[TripPlanner] = None, max_concurrency: Optional[int] = None,
+                 request_timeout: Optional[float] = None, queue_timeout: float = 1.0, read_timeout: float = 10.0):
+        self.planner = planner
+        self.max_concurrency = max_concurrency or int(os.getenv("SERVER_MAX_CONCURRENCY", "200"))
+        self.request_timeout = request_timeout or float(os.getenv("SERVER_REQUEST_TIMEOUT", "60"))
+        # How long a request may wait for a free slot before being rejected
+        self.queue_timeout = queue_timeout
+        # How long a client may take to send its request; idle connections do not count towards max_concurrency
+        self.read_timeout = read_timeout
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+
+    def is_ready(self) -> bool:
+        return self.planner is not None and self.in_flight < self.max_concurrency
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                try:
+                    method, path, body = await asyncio.wait_for(self._read_request(reader), self.read_timeout)
+                except asyncio.TimeoutError:
+                    raise HTTPError(408, f"Request not received within {self.read_timeout:g}s")
+                status, payload = await self._dispatch(method, path, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": True, "message": e.message}
+            await self._write_response(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_line(self, reader: asyncio.StreamReader) -> str:
+        try:
+            line = await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            # readline raises ValueError for lines longer than the reader's buffer limit
+            raise HTTPError(413, "Request line or header too long")
+        return line.decode("latin-1").strip()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = await self._read_line(reader)
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        method, path, _ = parts
+
+        headers = {}
+        while True:
+            line = await self._read_line(reader)
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], body
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        if path == "/healthz":
+            return 200, {"status": "ok"}
+        if path == "/readyz":
+            ready = self.is_ready()
+            return (200 if ready else 503), {
+                "ready": ready,
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency
+            }
+        if path == "/v1/itinerary":
+            if method != "POST":
+                raise HTTPError(405, "Use POST")
+            return await self._plan_trip(self._parse_trip_request(body))
+        raise HTTPError(404, f"Unknown path {path}")
+
+    def _parse_trip_request(self, body: bytes) -> Dict:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+
+        request = {}
+        for field, field_type in REQUIRED_FIELDS.items():
+            value = data.get(field)
+            # bool is a subclass of int, "duration": true is not a trip length
+            if not isinstance(value, field_type) or isinstance(value, bool):
+                raise HTTPError(400, f"'{field}' is required and must be {field_type.__name__}")
+            request[field] = value
+        if not 1 <= request["duration"] <= 14:
+            raise HTTPError(400, "'duration' must be between 1 and 14 days")
+        if request["user_city"] == request["destination_city"]:
+            raise HTTPError(400, "Origin and destination must be different")
+        request["language"] = data.get("language", "en")
+
+        for field, choices in CHOICES.items():
+            if request[field] not in choices:
+                raise HTTPError(400, f"'{field}' must be one of: {', '.join(choices)}")
+        return request
+
+    async def _plan_trip(self, request: Dict) -> Tuple[int, Dict]:
+        if self.planner is None:
+            raise HTTPError(503, "Planner is not initialised")
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(503, "Too many trips in flight, retry later")
+
+        self.in_flight += 1
+        try:
+            # The planner returns a partial, flagged itinerary rather than overrun the deadline
+            itinerary = await asyncio.wait_for(
+                self.planner.agenerate_itinerary(**request, deadline=Deadline(self.request_timeout)),
+                self.request_timeout + DEADLINE_GRACE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            raise HTTPError(504, f"Trip planning exceeded {self.request_timeout:g}s")
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+        if isinstance(itinerary, Itinerary):
+            return 200, itinerary.to_dict()
+        return 502, itinerary
+
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, service: TripService):
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Serving trip planner on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VoyageGPT trip planning HTTP service")
+    parser.add_argument("--host", default=os.getenv("SERVER_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SERVER_PORT", "8080")))
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Maximum trips planned at once")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    service = TripService(TripPlanner(), max_concurrency=args.max_concurrency, request_timeout=args.timeout)
+    asyncio.run(serve(args.host, args.port, service))
+
+
+if __name__ == "__main__":
+    main()
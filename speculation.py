@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Optional
+
+from itinerary_cache import adapt_reasoning
+
+
+class _Speculation:
+    """One speculative reasoning call for a (destination, mood, budget, transport) key"""
+
+    def __init__(self, request: Dict):
+        self.request = request
+        self.created_at = time.time()
+        self.sessions = set()
+        self.future = None
+        self.superseded = False
+        self.called = False
+        self.claimed = False
+
+
+class SpeculativePrefetcher:
+    """Starts the LLM reasoning call while the user is still choosing options
+
+    Sessions report their current selections with ``speculate``. After the
+    selections have been stable for ``settle_seconds`` the call runs in a bounded
+    pool; speculations no session is waiting for any more are cancelled, or skip
+    their upstream call if they have not reached it yet. ``claim`` serves the
+    Generate click from a finished or in-flight speculation, which it uses up:
+    one upstream call serves at most one plan. A per-server cap on
+    upstream calls per minute keeps speculation from eating into the quota.
+    """
+
+    def __init__(self, planner, max_workers: Optional[int] = None, max_calls_per_minute: Optional[int] = None,
+                 settle_seconds: float = 1.0, ttl_seconds: float = 300, claim_timeout: float = 30):
+        self.planner = planner
+        self.max_workers = max_workers or int(os.getenv("SPECULATION_WORKERS", "2"))
+        self.max_calls_per_minute = max_calls_per_minute or int(os.getenv("SPECULATION_MAX_CALLS_PER_MINUTE", "30"))
+        self.settle_seconds = settle_seconds
+        self.ttl_seconds = ttl_seconds
+        self.claim_timeout = claim_timeout
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="speculation")
+        self._lock = threading.Lock()
+        self._speculations = {}
+        self._session_keys = {}
+        self._call_times = deque()
+        self._counters = {
+            "requested": 0,
+            "started": 0,
+            "upstream_calls": 0,
+            "cancelled": 0,
+            "rejected_by_cap": 0,
+            "hits_ready": 0,
+            "hits_in_flight": 0,
+            "misses": 0,
+            "wasted_calls": 0
+        }
+
+    @staticmethod
+    def _key(request: Dict) -> tuple:
+        # The prompt names the transport mode, so a speculation only serves requests travelling the same way
+        return (request["destination_city"], request["mood"], request["budget"], request["transport_mode"])
+
+    def speculate(self, session_id: str, request: Dict) -> bool:
+        """Record a session's current selections, starting a speculation if needed"""
+        key = self._key(request)
+        with self._lock:
+            self._counters["requested"] += 1
+            self._evict_expired()
+
+            previous = self._session_keys.get(session_id)
+            if previous == key:
+                return True
+            if previous is not None:
+                self._leave(session_id, previous)
+            self._session_keys[session_id] = key
+
+            speculation = self._speculations.get(key)
+            if speculation is not None and not speculation.superseded:
+                speculation.sessions.add(session_id)
+                return True
+
+            pending = sum(1 for s in self._speculations.values() if not s.called and not s.superseded)
+            if len(self._call_times) + pending >= self.max_calls_per_minute:
+                self._counters["rejected_by_cap"] += 1
+                return False
+
+            speculation = _Speculation(dict(request))
+            speculation.sessions.add(session_id)
+            speculation.future = self._pool.submit(self._run, speculation)
+            self._speculations[key] = speculation
+            self._counters["started"] += 1
+            return True
+
+    def _leave(self, session_id: str, key: tuple):
+        """Drop a session from a speculation, cancelling it when nobody else wants it"""
+        speculation = self._speculations.get(key)
+        if speculation is None:
+            return
+        speculation.sessions.discard(session_id)
+        if speculation.sessions or speculation.called:
+            # Already calling upstream: let it finish, it may still be claimed by a later click
+            return
+        speculation.superseded = True
+        speculation.future.cancel()
+        del self._speculations[key]
+        self._counters["cancelled"] += 1
+
+    def _run(self, speculation: _Speculation) -> Optional[str]:
+        # Wait for the selections to settle before spending an upstream call
+        time.sleep(self.settle_seconds)
+        with self._lock:
+            if speculation.superseded:
+                return None
+            speculation.called = True
+            self._call_times.append(time.time())
+            self._counters["upstream_calls"] += 1
+
+        request = speculation.request
+        prompt = self.planner.prompts.create_trip_prompt(
+            request["mood"], request["budget"], request["duration"],
+            request["user_city"], request["destination_city"], request["transport_mode"]
+        )
+        return self.planner.backend.generate(prompt, request=request, settings=self.planner.generation.settings())
+
+    def claim(self, request: Dict, timeout: Optional[float] = None) -> Optional[str]:
+        """Return the speculated reasoning for a request, waiting up to ``timeout`` for an in-flight call
+
+        The speculation is used up by the claim whether or not it succeeds, so
+        later clicks query the backend themselves rather than reusing it.
+        """
+        key = self._key(request)
+        with self._lock:
+            self._evict_expired()
+            speculation = self._speculations.get(key)
+            if speculation is None or speculation.superseded:
+                self._counters["misses"] += 1
+                return None
+            self._forget(key, speculation)
+            speculation.claimed = True
+            in_flight = not speculation.future.done()
+
+        try:
+            response = speculation.future.result(timeout=self.claim_timeout if timeout is None else timeout)
+        except (CancelledError, TimeoutError):
+            response = None
+        except Exception as e:
+            # A failed speculation is just a miss, the planner queries the backend itself
+            print(f"Speculative call failed: {e}")
+            response = None
+
+        with self._lock:
+            if response is None:
+                self._counters["misses"] += 1
+                return None
+            speculation.claimed = True
+            self._counters["hits_in_flight" if in_flight else "hits_ready"] += 1
+
+        old = speculation.request
+        return adapt_reasoning(response, old["user_city"], request["user_city"], old["duration"], request["duration"])
+
+    def _evict_expired(self):
+        now = time.time()
+        while self._call_times and now - self._call_times[0] > 60:
+            self._call_times.popleft()
+
+        for key, speculation in list(self._speculations.items()):
+            if now - speculation.created_at <= self.ttl_seconds or not speculation.future.done():
+                continue
+            if speculation.called and not speculation.claimed:
+                self._counters["wasted_calls"] += 1
+            self._forget(key, speculation)
+
+    def _forget(self, key: tuple, speculation: _Speculation):
+        """Remove a speculation so the next ``speculate`` for its key starts a new one"""
+        for session_id in speculation.sessions:
+            if self._session_keys.get(session_id) == key:
+                del self._session_keys[session_id]
+        del self._speculations[key]
+
+    def stats(self) -> Dict:
+        """Speculation hit rate and wasted upstream calls for this server process"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["in_flight"] = sum(1 for s in self._speculations.values() if not s.future.done())
+        hits = counters["hits_ready"] + counters["hits_in_flight"]
+        claims = hits + counters["misses"]
+        counters["hit_rate"] = hits / claims if claims else 0.0
+        return counters
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
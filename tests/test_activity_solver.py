@@ -0,0 +1,66 @@
+import itertools
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activity_solver import COST_STEPS, MIN_MOOD_SCORE, _solve_dp, select_activities
+from catalog import ACTIVITIES, Activity, get_candidate_activities
+from scheduler import schedule_day
+
+MOODS = ("adventurous", "fun", "peaceful")
+
+
+def brute_force_score(candidates, mood, allowance, count_limit):
+    """Best score over every subset of at most count_limit activities, with the DP's cost rounding"""
+    unit = max(1, math.ceil(allowance / COST_STEPS))
+    capacity = max(0, allowance) // unit
+    best = 0
+    for size in range(count_limit + 1):
+        for combo in itertools.combinations(candidates, size):
+            if sum(math.ceil(a.cost / unit) for a in combo) <= capacity:
+                best = max(best, sum(a.score(mood) for a in combo))
+    return best
+
+
+def check_dp(candidates, mood, allowance, count_limit):
+    chosen = _solve_dp(candidates, mood, allowance, count_limit)
+    assert len(chosen) <= count_limit
+    assert sum(a.cost for a in chosen) <= allowance
+    assert sum(a.score(mood) for a in chosen) == brute_force_score(candidates, mood, allowance, count_limit)
+
+
+def test_dp_matches_brute_force_on_random_count_limited_instances():
+    rng = random.Random(7)
+    for _ in range(1500):
+        size = rng.randint(2, 8)
+        candidates = [
+            Activity(f"activity {i}", rng.choice([0, 100, 300, 500, 800, 1200, 2000, 3500]), 2,
+                     rng.randint(0, 10), rng.randint(0, 10), rng.randint(0, 10))
+            for i in range(size)
+        ]
+        check_dp(candidates, rng.choice(MOODS), rng.choice([300, 1000, 2500, 6000]), rng.randint(1, size - 1))
+
+
+def test_dp_matches_brute_force_on_catalog_count_limited_cases():
+    for destination in ("Goa", "Manali", "Rajasthan", "Shimla"):
+        for mood in MOODS:
+            candidates = [a for a in get_candidate_activities(destination) if a.score(mood) >= MIN_MOOD_SCORE]
+            for count_limit in (2, 3, 5):
+                for allowance in (1000, 2500, 6000):
+                    check_dp(candidates[:12], mood, allowance, min(count_limit, len(candidates[:12]) - 1))
+
+
+def test_select_activities_stays_on_mood_and_within_allowance():
+    for destination in ("Goa", "Manali", "Rajasthan", "Shimla"):
+        for mood in MOODS:
+            for per_day in (1000, 2500, 6000):
+                days = select_activities(destination, mood, 7, per_day * 7)
+                names = [name for day in days for name in day]
+                assert len(days) == 7
+                assert len(names) == len(set(names))
+                assert all(schedule_day(day).feasible for day in days)
+                assert all(ACTIVITIES[name].score(mood) >= MIN_MOOD_SCORE for name in names)
+                assert sum(ACTIVITIES[name].cost for name in names) <= per_day * 7
@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recommender import _tokenize, get_recommender
+
+
+def test_tokenize_strips_plurals():
+    assert _tokenize("Beaches, cities and hill forts") == ["beach", "city", "and", "hill", "fort"]
+    assert _tokenize("glass bus oasis") == ["glass", "bus", "oasis"]
+
+
+def test_plural_and_singular_keywords_rank_alike():
+    recommender = get_recommender()
+    assert recommender.recommend(keywords="beaches", origin="Goa") == recommender.recommend(keywords="beach", origin="Goa")
+
+
+def test_keyword_matches_rank_above_mood_fit():
+    recommender = get_recommender()
+    for mood in ("adventurous", "fun", "peaceful"):
+        for keywords in ("beaches", "temples", "snow"):
+            results = recommender.recommend(mood=mood, keywords=keywords, origin="Goa", top_k=len(recommender.destinations))
+            query = recommender._keyword_vector(keywords)
+            if query is None:
+                continue
+            matched = [recommender.tfidf[recommender.index[r["destination"]]] @ query > 0 for r in results]
+            # Every matching destination comes before every non-matching one
+            assert matched == sorted(matched, reverse=True)
+    assert recommender.recommend(mood="adventurous", keywords="beaches", origin="Goa")[0]["destination"] == "Kerala"
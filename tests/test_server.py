@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MAX_BODY_BYTES, HTTPError, TripService
+
+TRIP = {
+    "mood": "fun", "budget": "budget", "duration": 5,
+    "user_city": "Mumbai", "destination_city": "Goa", "transport_mode": "train"
+}
+
+
+def parse(data) -> dict:
+    return TripService()._parse_trip_request(json.dumps(data).encode("utf-8"))
+
+
+def read(raw: bytes, limit: int = 2 ** 16):
+    async def run():
+        reader = asyncio.StreamReader(limit=limit)
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await TripService()._read_request(reader)
+    return asyncio.run(run())
+
+
+def status_of(call) -> int:
+    with pytest.raises(HTTPError) as error:
+        call()
+    return error.value.status
+
+
+def test_parse_accepts_valid_trip():
+    assert parse(TRIP) == dict(TRIP, language="en")
+    assert parse(dict(TRIP, language="hi"))["language"] == "hi"
+
+
+@pytest.mark.parametrize("change", [
+    {"duration": True},
+    {"duration": "5"},
+    {"duration": 0},
+    {"duration": 15},
+    {"mood": "grumpy"},
+    {"budget": "free"},
+    {"transport_mode": "rocket"},
+    {"language": "xx"},
+    {"destination_city": "Mumbai"},
+    {"user_city": None}
+])
+def test_parse_rejects_invalid_fields(change):
+    assert status_of(lambda: parse(dict(TRIP, **change))) == 400
+
+
+def test_parse_rejects_non_object_bodies():
+    assert status_of(lambda: TripService()._parse_trip_request(b"not json")) == 400
+    assert status_of(lambda: parse([TRIP])) == 400
+
+
+def test_read_request_returns_method_path_and_body():
+    body = json.dumps(TRIP).encode("utf-8")
+    raw = b"POST /v1/itinerary?x=1 HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+    assert read(raw) == ("POST", "/v1/itinerary", body)
+    assert read(b"GET /healthz HTTP/1.1\r\n\r\n") == ("GET", "/healthz", b"")
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"POST / HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST / HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400),
+    (b"POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY_BYTES + 1), 413),
+    (b"POST / HTTP/1.1\r\nX-Long: " + b"a" * 2048 + b"\r\n\r\n", 413),
+    (b"GET /" + b"a" * 2048 + b" HTTP/1.1\r\n\r\n", 413)
+])
+def test_read_request_rejects_bad_requests(raw, status):
+    assert status_of(lambda: read(raw, limit=1024)) == status
+
+
+def test_bad_request_gets_a_response():
+    async def run():
+        server = await asyncio.start_server(TripService().handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /v1/itinerary HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response
+    assert asyncio.run(run()).startswith(b"HTTP/1.1 400 Bad Request")
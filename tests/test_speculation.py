@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from speculation import SpeculativePrefetcher
+
+REQUEST = {
+    "destination_city": "Goa", "mood": "fun", "budget": "mid-range",
+    "user_city": "Mumbai", "duration": 7, "transport_mode": "flight"
+}
+
+
+class StubPlanner:
+    """Just enough of TripPlanner for speculative calls, counting upstream calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.backend = self
+        self.generation = self
+        self.prompts = self
+
+    def settings(self):
+        return {}
+
+    def create_trip_prompt(self, mood, budget, duration, user_city, destination_city, transport_mode):
+        return f"Plan a {duration}-day {mood} trip to {destination_city} from {user_city} by {transport_mode}."
+
+    def generate(self, prompt, request=None, settings=None):
+        self.calls += 1
+        return prompt
+
+
+def make_prefetcher():
+    planner = StubPlanner()
+    return planner, SpeculativePrefetcher(planner, settle_seconds=0.01)
+
+
+def test_claim_misses_on_other_transport_mode():
+    planner, prefetcher = make_prefetcher()
+    prefetcher.speculate("session", REQUEST)
+    assert prefetcher.claim(dict(REQUEST, user_city="Delhi", transport_mode="bus"), timeout=5) is None
+    assert prefetcher.claim(dict(REQUEST, user_city="Delhi"), timeout=5) == \
+        "Plan a 7-day fun trip to Goa from Delhi by flight."
+    prefetcher.shutdown()
+
+
+def test_speculation_serves_one_claim():
+    planner, prefetcher = make_prefetcher()
+    prefetcher.speculate("session", REQUEST)
+    assert prefetcher.claim(REQUEST, timeout=5) is not None
+    assert prefetcher.claim(REQUEST, timeout=5) is None
+
+    # The same selections start a new speculation afterwards
+    prefetcher.speculate("session", REQUEST)
+    assert prefetcher.claim(REQUEST, timeout=5) is not None
+    stats = prefetcher.stats()
+    assert planner.calls == 2
+    assert stats["hits_ready"] + stats["hits_in_flight"] == 2
+    assert stats["misses"] == 1
+    prefetcher.shutdown()
@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import activity_cost
+from deadline import Deadline
+from itinerary import Itinerary
+from trip_planner import TripPlanner
+
+TRIP = ("fun", "mid-range", 3, "Mumbai", "Goa", "train")
+
+
+@pytest.fixture
+def planner(monkeypatch):
+    monkeypatch.setenv("GENERATION_BACKEND", "template")
+    monkeypatch.setenv("ITINERARY_CACHE", "off")
+    return TripPlanner()
+
+
+class BrokenCache:
+    def lookup(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    def store(self, *args):
+        raise sqlite3.OperationalError("database or disk is full")
+
+
+def test_cache_errors_do_not_fail_the_request(planner):
+    planner.itinerary_cache = BrokenCache()
+    planner.backend.cacheable = True
+    itinerary = planner.generate_itinerary(*TRIP)
+    assert isinstance(itinerary, Itinerary)
+    assert not itinerary.cache_hit
+
+
+def test_blocking_backend_is_cut_off_at_the_deadline(planner):
+    release = threading.Event()
+
+    def blocking_generate(*args, **kwargs):
+        release.wait(5)
+        return "too late"
+
+    planner.backend.generate = blocking_generate
+    start = time.monotonic()
+    itinerary = planner.generate_itinerary(*TRIP, deadline=Deadline(0.5))
+    release.set()
+    assert time.monotonic() - start < 1.5
+    assert "fallback_reasoning" in itinerary.flags
+
+
+def test_hanging_translations_do_not_hold_up_other_requests(planner):
+    release = threading.Event()
+
+    def translate_text(text, target_language, timeout=None):
+        if target_language == "hi":
+            release.wait(5)
+        return f"[{target_language}] {text}"
+
+    planner.translation_available = True
+    planner.translate_text = translate_text
+    itinerary = planner.generate_itinerary(*TRIP)
+
+    # Every text of the first request hangs past its deadline...
+    stuck = planner.translate_itinerary(itinerary, "hi", Deadline(1.5))
+    assert "untranslated_reasoning" in stuck.flags
+    # ...while the next request still gets its translations
+    translated = planner.translate_itinerary(itinerary, "ta", Deadline(1.5))
+    release.set()
+    assert "untranslated_reasoning" not in translated.flags
+    assert translated.reasoning.startswith("[ta] ")
+
+
+def test_no_translation_started_without_time_for_a_call(planner):
+    planner.translation_available = True
+    planner.translate_text = lambda text, target_language, timeout=None: f"[{target_language}] {text}"
+    itinerary = planner.generate_itinerary(*TRIP)
+    result = planner.translate_itinerary(itinerary, "hi", Deadline(planner.translation_call_seconds / 2))
+    assert {"untranslated_reasoning", "untranslated_activities"} <= set(result.flags)
+    assert result.reasoning == itinerary.reasoning
+
+
+def test_day_cost_includes_its_activities(planner):
+    itinerary = planner.generate_itinerary("fun", "luxury", 5, "Mumbai", "Goa", "flight")
+    for day in itinerary.days:
+        base = planner._estimate_daily_cost("luxury", "fun", day.day == 1)
+        assert day.estimated_cost == base + sum(activity_cost(activity) for activity in day.activities)
+    assert any(day.estimated_cost > planner._estimate_daily_cost("luxury", "fun", day.day == 1)
+               for day in itinerary.days)
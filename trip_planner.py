@@ -1,12 +1,60 @@
+import asyncio
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait
+from typing import Dict, List, Optional, Tuple
+
+from backends import GenerationBackend, TemplateBackend, create_backend
+from activity_solver import select_activities
+from catalog import activity_cost
+from deadline import Deadline
+from itinerary import CostBreakdown, DayPlan, Itinerary
+from itinerary_cache import ItineraryCache
+from scheduler import schedule_day
+
+
 # === Prompts (inlined from prompts.py) ===
+# Characters of model reasoning kept in an itinerary
+REASONING_CHARS = 500
+
+
 class TripPrompts:
-    """Class to handle AI prompts for trip planning"""
+    """Class to handle AI prompts for trip planning
+    
+    ``style`` selects the trip prompt template: "compact" (default) names each city
+    once and asks only for what the planner keeps, "detailed" is the original long form.
+    """
     
-    def __init__(self):
+    def __init__(self, style: Optional[str] = None):
         self.base_context = """You are a professional travel advisor with expertise in creating personalized itineraries. 
         You understand different travel moods, budget constraints, and can provide detailed reasoning for your recommendations."""
+        self.style = style or os.getenv("PROMPT_STYLE", "compact")
+        # Answer length that fills the kept reasoning, about 6 characters per word
+        self.target_words = REASONING_CHARS // 6
     
     def create_trip_prompt(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str) -> str:
+        """Create the prompt for trip generation in the configured style"""
+        if self.style == "detailed":
+            return self.create_detailed_trip_prompt(mood, budget, duration, user_city, destination_city, transport_mode)
+        return self.create_compact_trip_prompt(mood, budget, duration, user_city, destination_city, transport_mode)
+    
+    def create_compact_trip_prompt(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str) -> str:
+        """Create a short prompt asking only for the reasoning the planner keeps"""
+        mood_hints = {
+            "adventurous": "thrills, outdoors",
+            "fun": "nightlife, social",
+            "peaceful": "calm, nature"
+        }
+        budget_hints = {
+            "budget": "under ₹50k",
+            "mid-range": "₹50k-1.5L",
+            "luxury": "₹1.5L+"
+        }
+        
+        return f"""Indian travel advisor. In about {self.target_words} words, explain why {destination_city} suits a {duration}-day {mood} trip ({mood_hints.get(mood, mood)}) at {budget} spend ({budget_hints.get(budget, budget)}) from {user_city} by {transport_mode}. Name 2-3 fitting activities and one route tip with costs in ₹.
+Answer:"""
+    
+    def create_detailed_trip_prompt(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str) -> str:
         """Create a comprehensive prompt for trip generation"""
         
         mood_descriptions = {
@@ -60,10 +108,32 @@ Provide a comprehensive response with specific activities in {destination_city},
         Provide detailed reasoning covering the destination's appeal, cost-effectiveness, and mood alignment."""
 
 
-import os
-import time
-import requests
-from typing import Dict, List, Optional
+class GenerationController:
+    """Chooses generation limits from the parts of the model output the planner actually uses
+    
+    Only the first ``REASONING_CHARS`` characters of the answer end up in an
+    itinerary (the daily plan and costs come from the catalog), so asking for
+    more tokens than that only adds upstream latency and quota.
+    """
+    
+    CHARS_PER_TOKEN = 4
+    # Where a model starts on sections the planner throws away
+    STOP_SEQUENCES = ["\n\n\n", "\nDay 1", "Trip Requirements:", "\nItinerary"]
+    
+    def __init__(self, reasoning_chars: int = REASONING_CHARS, margin: float = 1.25):
+        self.reasoning_chars = reasoning_chars
+        self.margin = margin
+    
+    def max_new_tokens(self, fields: Tuple[str, ...] = ("reasoning",)) -> int:
+        chars = self.reasoning_chars if "reasoning" in fields else 0
+        return max(16, int(chars / self.CHARS_PER_TOKEN * self.margin))
+    
+    def settings(self, fields: Tuple[str, ...] = ("reasoning",)) -> Dict:
+        return {
+            "max_new_tokens": self.max_new_tokens(fields),
+            "stop": list(self.STOP_SEQUENCES)
+        }
+
 
 # Load environment variables from .env file
 try:
@@ -85,21 +155,15 @@ except ImportError:
         TRANSLATION_AVAILABLE = False
         print("Translation not available: neither deep-translator nor googletrans installed")
 
+# Texts of one itinerary translated in parallel; each itinerary gets its own workers so a
+# translator call still hanging at one request's deadline cannot hold up other requests
+TRANSLATION_WORKERS = 8
+
 class TripPlanner:
-    def __init__(self):
-        # Get Hugging Face API token from environment
-        self.hf_token = os.getenv("HUGGING_FACE_TOKEN")
-        if not self.hf_token:
-            raise ValueError("HUGGING_FACE_TOKEN environment variable is required. Please set it in your environment or .env file.")
-        self.api_url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
-        
-        # Alternative free small models to try (optimized for size)
-        self.models = [
-            "EleutherAI/gpt-neo-125M",  # Small and fast
-            "gpt2",  # Reliable small model
-            "facebook/blenderbot-400M-distill",  # Compact conversational model
-            "microsoft/DialoGPT-small"  # Smaller DialoGPT variant
-        ]
+    def __init__(self, backend: Optional[GenerationBackend] = None):
+        # Text generation backend (Hugging Face, local OpenAI-compatible server or templates)
+        self.backend = backend or create_backend()
+        self.template_backend = TemplateBackend()
         
         # Translation setup with language mappings
         self.translation_available = TRANSLATION_AVAILABLE
@@ -115,15 +179,32 @@ class TripPlanner:
             "ml": "ml"   # Malayalam
         }
         
-        self.headers = {
-            "Authorization": f"Bearer {self.hf_token}",
-            "Content-Type": "application/json"
-        }
-        
         self.prompts = TripPrompts()
+        # Token limits and stop sequences sent with every generation call
+        self.generation = GenerationController()
+        
+        # Persistent store for reusing itineraries of near-identical requests
+        self.itinerary_cache = None
+        if os.getenv("ITINERARY_CACHE", "on") != "off":
+            try:
+                self.itinerary_cache = ItineraryCache()
+            except Exception as e:
+                print(f"Itinerary cache unavailable: {e}")
+        
+        # Optional SpeculativePrefetcher whose finished or in-flight calls serve generation
+        self.prefetcher = None
+        
+        # End-to-end time budget per itinerary, and the part of it kept back for translation
+        self.deadline_seconds = float(os.getenv("PLANNER_DEADLINE_SECONDS", "25"))
+        self.translation_reserve_seconds = float(os.getenv("TRANSLATION_RESERVE_SECONDS", "4"))
+        # Typical latency of one translator call; with less time left no call is started
+        self.translation_call_seconds = float(os.getenv("TRANSLATION_CALL_SECONDS", "1"))
     
-    def translate_text(self, text: str, target_language: str) -> str:
-        """Translate text to target language using available translation services"""
+    def translate_text(self, text: str, target_language: str, timeout: Optional[float] = None) -> str:
+        """Translate text to target language using available translation services
+        
+        ``timeout`` bounds the googletrans request; deep-translator has no timeout setting.
+        """
         if not self.translation_available or target_language == "en":
             return text
         
@@ -140,7 +221,7 @@ class TripPlanner:
                 # Fallback to googletrans if deep-translator fails
                 try:
                     from googletrans import Translator
-                    translator = Translator()
+                    translator = Translator(timeout=timeout) if timeout else Translator()
                     result = translator.translate(text, dest=target_language, src='en')
                     return result.text
                 except:
@@ -151,110 +232,41 @@ class TripPlanner:
             
         return text  # Return original text if translation fails
 
-    def query_huggingface_api(self, prompt: str, model: Optional[str] = None) -> str:
-        """Query Hugging Face API with fallback models"""
-        models_to_try = [model] if model is not None else self.models
-        
-        for model_name in models_to_try:
-            if not model_name:
-                continue
-                
-            api_url = f"https://api-inference.huggingface.co/models/{model_name}"
-            
-            payload = {
-                "inputs": prompt,
-                "parameters": {
-                    "max_new_tokens": 500,
-                    "temperature": 0.7,
-                    "do_sample": True,
-                    "top_p": 0.9
-                }
-            }
-            
-            try:
-                response = requests.post(
-                    api_url,
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Handle different response formats
-                    if isinstance(result, list) and len(result) > 0:
-                        if "generated_text" in result[0]:
-                            return result[0]["generated_text"]
-                        elif "text" in result[0]:
-                            return result[0]["text"]
-                    elif isinstance(result, dict):
-                        if "generated_text" in result:
-                            return result["generated_text"]
-                        elif "text" in result:
-                            return result["text"]
-                    
-                    return str(result)
-                
-                elif response.status_code == 503:
-                    # Model is loading, wait and retry
-                    time.sleep(2)
-                    continue
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Error with model {model_name}: {e}")
-                continue
-        
-        # If all models fail, return a fallback response
-        return self._generate_fallback_response(prompt)
-    
-    def _generate_fallback_response(self, prompt: str) -> str:
+    def query_model(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None) -> str:
+        """Query the configured backend, falling back to a canned response"""
+        response = self._query_models(prompt, model, request)
+        if response is None:
+            # If all models fail, return a fallback response
+            return self._generate_fallback_response(prompt)
+        return response
+    
+    # Kept for callers written against the Hugging Face-only planner
+    query_huggingface_api = query_model
+    
+    def _query_models(self, prompt: str, model: Optional[str] = None, request: Optional[Dict] = None,
+                      deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Ask the backend for an answer, returning None if it could not produce one in time"""
+        try:
+            if deadline is None or deadline.timeout() is None:
+                return self.backend.generate(prompt, model, request, settings=self.generation.settings(), deadline=deadline)
+            # Backends are handed the deadline, waiting on a worker enforces it for those that block regardless
+            pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="generation")
+            future = pool.submit(self.backend.generate, prompt, model, request,
+                                 settings=self.generation.settings(), deadline=deadline)
+            pool.shutdown(wait=False)
+            return future.result(timeout=deadline.timeout())
+        except TimeoutError:
+            print("Generation error: no answer before the deadline")
+            return None
+        except Exception as e:
+            print(f"Generation error: {e}")
+            return None
+    
+    def _generate_fallback_response(self, prompt: str, request: Optional[Dict] = None) -> str:
         """Generate a basic response when API is unavailable"""
-        if "adventurous" in prompt.lower():
-            return """I'd recommend an adventurous trip to Ladakh! Here's why:
-
-            Ladakh offers incredible adventure activities like motorcycle tours, river rafting, and high-altitude trekking through stunning Himalayan landscapes. The region has diverse terrains from barren mountains to pristine lakes, perfect for thrill-seekers.
-
-            Activities could include:
-            - Leh-Ladakh bike expedition
-            - Pangong Tso and Tso Moriri lake visits
-            - River rafting in Zanskar River
-            - Trekking in Markha Valley
-            - Magnetic Hill and Khardung La Pass
-
-            This destination perfectly matches your adventurous spirit with its world-class high-altitude activities and breathtaking Himalayan beauty."""
-        
-        elif "peaceful" in prompt.lower():
-            return """For a peaceful retreat, I suggest Manali and Shimla. Here's my reasoning:
-
-            These hill stations offer serene mountain environments, cool weather, and breathtaking views perfect for relaxation and rejuvenation. The peaceful atmosphere of the Himalayas provides an ideal escape from city life.
-
-            Peaceful activities include:
-            - Morning walks in apple orchards and pine forests
-            - Scenic viewpoints with mountain panoramas
-            - Quiet cafes with mountain views
-            - Nature photography and bird watching
-            - Peaceful temple visits (Hidimba Devi, Jakhu Temple)
-            - Leisurely strolls through hill station markets
-
-            These destinations will refresh your mind with their tranquil mountain atmosphere and natural beauty."""
-        
-        else:  # fun
-            return """For a fun-filled trip, I recommend Goa! Here's why:
-
-            Goa offers an incredible mix of vibrant nightlife, beautiful beaches, delicious food, and relaxed culture. It's perfect for those seeking entertainment and social experiences.
-
-            Fun activities include:
-            - Beach parties and water sports in North Goa
-            - Exploring spice plantations and local markets
-            - Portuguese heritage tours in Old Goa
-            - Sunset cruises and casino experiences
-            - Local Goan cuisine and feni tasting
-            - Flea markets and beach shacks
-
-            Goa guarantees non-stop fun with its lively atmosphere and endless entertainment options."""
+        return self.template_backend.fallback_response(prompt, request)
     
-    def generate_trip_plan(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str) -> Dict:
+    def generate_trip_plan(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str) -> Itinerary:
         """Main method to generate a complete trip plan"""
         
         # Generate AI prompt
@@ -268,7 +280,7 @@ class TripPlanner:
         )
         
         # Get AI response
-        ai_response = self.query_huggingface_api(prompt)
+        ai_response = self.query_model(prompt)
         
         # Parse response into structured format
         trip_data = self.parse_ai_response(
@@ -283,8 +295,12 @@ class TripPlanner:
         
         return trip_data
     
-    def parse_ai_response(self, response: str, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str) -> Dict:
-        """Parse AI response into structured itinerary format"""
+    def parse_ai_response(self, response: str, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str, activities: Optional[List[List[str]]] = None) -> Itinerary:
+        """Parse AI response into structured itinerary format
+        
+        ``activities`` reuses the daily activities of a cached itinerary instead of
+        looking them up again; costs are always recomputed for this route and duration.
+        """
         
         # Clean the response - remove the original prompt if it's included
         lines = response.split('\n')
@@ -320,7 +336,10 @@ class TripPlanner:
         
         # Generate daily plan with location-specific activities
         daily_plan = []
-        location_activities = self._get_location_specific_activities(destination_city, mood, duration)
+        if activities:
+            location_activities = activities
+        else:
+            location_activities = self._get_location_specific_activities(destination_city, mood, duration, budget)
         
         for i in range(duration):
             day_num = i + 1
@@ -330,130 +349,44 @@ class TripPlanner:
                 # Fallback for longer trips
                 day_activity = location_activities[i % len(location_activities)]
             
-            daily_plan.append({
-                "day": day_num,
-                "theme": f"Day {day_num} - {mood.title()} Experience",
-                "activities": day_activity if isinstance(day_activity, list) else [day_activity],
-                "estimated_cost": self._estimate_daily_cost(budget, mood, day_num == 1)
-            })
+            # Visiting order and times within opening hours
+            schedule = schedule_day(day_activity if isinstance(day_activity, list) else [day_activity])
+            daily_plan.append(DayPlan(
+                day=day_num,
+                theme=f"Day {day_num} - {mood.title()} Experience" if schedule.activities else f"Day {day_num} - Free Day",
+                activities=schedule.activities,
+                estimated_cost=self._estimate_daily_cost(budget, mood, day_num == 1, schedule.activities),
+                times=schedule.times
+            ))
         
         # Calculate total costs
         accommodation_cost = self._calculate_accommodation_cost(budget, duration)
         food_cost = self._calculate_food_cost(budget, duration)
-        activity_cost = self._calculate_activity_cost(mood, budget, duration)
+        activity_cost = self._calculate_activity_cost(daily_plan)
         misc_cost = self._calculate_misc_cost(budget, duration)
         
-        total_cost = transport_costs + accommodation_cost + food_cost + activity_cost + misc_cost
-        
-        return {
-            "destination": destination_city,
-            "duration": duration,
-            "mood": mood,
-            "budget": budget,
-            "reasoning": cleaned_response[:500] + "..." if len(cleaned_response) > 500 else cleaned_response,
-            "daily_plan": daily_plan,
-            "total_cost": total_cost,
-            "cost_breakdown": {
-                "transport": transport_costs,
-                "accommodation": accommodation_cost,
-                "food": food_cost,
-                "activities": activity_cost,
-                "miscellaneous": misc_cost
-            },
-            "transport_details": {
-                "mode": transport_mode,
-                "cost": transport_costs,
-                "route": f"{user_city} to {destination_city}"
-            }
-        }
+        return Itinerary(
+            destination=destination_city,
+            duration=duration,
+            mood=mood,
+            budget=budget,
+            reasoning=cleaned_response[:REASONING_CHARS] + "..." if len(cleaned_response) > REASONING_CHARS else cleaned_response,
+            days=daily_plan,
+            costs=CostBreakdown(
+                transport=transport_costs,
+                accommodation=accommodation_cost,
+                food=food_cost,
+                activities=activity_cost,
+                miscellaneous=misc_cost
+            ),
+            user_city=user_city,
+            transport_mode=transport_mode
+        )
     
-    def _get_location_specific_activities(self, destination: str, mood: str, duration: int) -> List[List[str]]:
-        """Get location and mood specific activities"""
-        
-        # Define activities based on destination and mood
-        activity_database = {
-            "Goa": {
-                "adventurous": [
-                    ["Water sports at Baga Beach", "Scuba diving", "Jet skiing"],
-                    ["Dudhsagar Falls trek", "Spice plantation tour", "Kayaking"],
-                    ["Parasailing", "Dolphin spotting cruise", "Beach volleyball"]
-                ],
-                "fun": [
-                    ["Beach hopping", "Flea market shopping", "Beach parties"],
-                    ["Casino cruise", "Nightlife in Tito's", "Live music venues"],
-                    ["Food tours", "Local bars", "Cultural shows"]
-                ],
-                "peaceful": [
-                    ["Sunrise meditation on beach", "Ayurvedic spa", "Quiet beach walks"],
-                    ["Old Goa churches", "Peaceful backwaters", "Yoga sessions"],
-                    ["Sunset watching", "Reading by the beach", "Nature photography"]
-                ]
-            },
-            "Manali": {
-                "adventurous": [
-                    ["Rohtang Pass adventure", "River rafting", "Paragliding"],
-                    ["Solang Valley skiing", "Mountain biking", "Rock climbing"],
-                    ["Trekking to Bhrigu Lake", "Adventure sports", "Camping"]
-                ],
-                "fun": [
-                    ["Mall Road shopping", "Local cafes", "Cultural programs"],
-                    ["Apple orchard visits", "Local festivals", "Mountain railways"],
-                    ["Photography tours", "Local markets", "Folk performances"]
-                ],
-                "peaceful": [
-                    ["Hidimba Temple visit", "Nature walks", "Mountain meditation"],
-                    ["Hot springs relaxation", "Quiet mountain views", "Bird watching"],
-                    ["Peaceful forest walks", "Sunset points", "Reading in nature"]
-                ]
-            },
-            "Rajasthan": {
-                "adventurous": [
-                    ["Desert safari", "Camel riding", "Dune bashing"],
-                    ["Fort exploration", "Heritage walks", "Desert camping"],
-                    ["Hot air ballooning", "Wildlife safari", "Adventure tours"]
-                ],
-                "fun": [
-                    ["Cultural shows", "Folk dance", "Royal dining"],
-                    ["Colorful markets", "Handicraft shopping", "Palace tours"],
-                    ["Festival celebrations", "Traditional cuisine", "Local entertainment"]
-                ],
-                "peaceful": [
-                    ["Palace gardens", "Quiet temples", "Lakeside meditation"],
-                    ["Sunrise palace views", "Peaceful courtyards", "Garden walks"],
-                    ["Traditional art viewing", "Quiet museums", "Spiritual sites"]
-                ]
-            }
-        }
-        
-        # Get activities for the destination or use generic ones
-        if destination in activity_database:
-            activities = activity_database[destination].get(mood, [])
-        else:
-            # Generic activities based on mood
-            generic_activities = {
-                "adventurous": [
-                    ["Local adventure sports", "Outdoor activities", "Hiking trails"],
-                    ["Cultural exploration", "Local tours", "Adventure experiences"],
-                    ["Nature activities", "Exciting experiences", "Local adventures"]
-                ],
-                "fun": [
-                    ["Local entertainment", "Cultural shows", "Shopping"],
-                    ["Social activities", "Local festivals", "Food tours"],
-                    ["Nightlife exploration", "Local experiences", "Entertainment venues"]
-                ],
-                "peaceful": [
-                    ["Nature walks", "Quiet places", "Meditation spots"],
-                    ["Peaceful attractions", "Serene locations", "Relaxation"],
-                    ["Spiritual sites", "Calm experiences", "Quiet exploration"]
-                ]
-            }
-            activities = generic_activities.get(mood, [["Explore local attractions", "Visit famous sites", "Try local cuisine"]])
-        
-        # Extend activities if duration is longer than available activities
-        while len(activities) < duration:
-            activities.extend(activities[:duration-len(activities)])
-        
-        return activities[:duration]
+    def _get_location_specific_activities(self, destination: str, mood: str, duration: int, budget: str) -> List[List[str]]:
+        """Get the best mood-matching activities for the budget tier, laid out per day"""
+        allowance = self._calculate_activity_allowance(budget, duration)
+        return select_activities(destination, mood, duration, allowance)
     
     def _calculate_transport_cost(self, origin: str, destination: str, transport_mode: str) -> int:
         """Calculate transport costs"""
@@ -484,24 +417,18 @@ class TripPlanner:
         }
         return per_day.get(budget, 1200) * duration
     
-    def _calculate_activity_cost(self, mood: str, budget: str, duration: int) -> int:
-        """Calculate activity costs"""
-        mood_multipliers = {
-            "adventurous": 1.5,
-            "fun": 1.2,
-            "peaceful": 0.8
-        }
-        
-        budget_base = {
+    def _calculate_activity_allowance(self, budget: str, duration: int) -> int:
+        """Calculate how much the budget tier allows for activities"""
+        per_day = {
             "budget": 1000,
             "mid-range": 2500,
             "luxury": 6000
         }
-        
-        base = budget_base.get(budget, 2000)
-        multiplier = mood_multipliers.get(mood, 1.0)
-        
-        return int(base * multiplier * duration)
+        return per_day.get(budget, 2000) * duration
+    
+    def _calculate_activity_cost(self, daily_plan: List[DayPlan]) -> int:
+        """Calculate activity costs from the catalog prices of the planned activities"""
+        return sum(activity_cost(activity) for day in daily_plan for activity in day.activities)
     
     def _calculate_misc_cost(self, budget: str, duration: int) -> int:
         """Calculate miscellaneous costs"""
@@ -512,8 +439,8 @@ class TripPlanner:
         }
         return per_day.get(budget, 750) * duration
     
-    def _estimate_daily_cost(self, budget: str, mood: str, is_first_day: bool) -> int:
-        """Estimate daily cost breakdown"""
+    def _estimate_daily_cost(self, budget: str, mood: str, is_first_day: bool, activities: List[str] = ()) -> int:
+        """Estimate daily cost breakdown: the tier's daily spend plus the catalog prices of the day's activities"""
         base_daily = {
             "budget": 2000,
             "mid-range": 4000,
@@ -526,69 +453,223 @@ class TripPlanner:
         if is_first_day:
             daily_cost = int(daily_cost * 1.3)
         
-        return daily_cost
+        return daily_cost + sum(activity_cost(activity) for activity in activities)
     
-    def translate_itinerary(self, itinerary: Dict, target_language: str) -> Dict:
-        """Translate itinerary content to target language"""
+    def translate_itinerary(self, itinerary: Itinerary, target_language: str, deadline: Optional[Deadline] = None) -> Itinerary:
+        """Translate itinerary content to target language, keeping English for texts not done by the deadline"""
         if not self.translation_available or target_language == "en":
             return itinerary
-            
-        translated_itinerary = itinerary.copy()
+        
+        deadline = deadline or Deadline()
+        texts = self._translation_texts(itinerary)
+        if deadline.remaining() < self.translation_call_seconds:
+            # Calls started now would not finish in time, keep the English texts
+            return self._apply_translations(itinerary, [None] * len(texts))
+        
+        pool = ThreadPoolExecutor(max_workers=min(TRANSLATION_WORKERS, len(texts)), thread_name_prefix="translation")
+        futures = [pool.submit(self.translate_text, text, target_language, deadline.timeout()) for text in texts]
+        done, _ = wait(futures, timeout=deadline.timeout())
+        # Drop queued texts; calls already running finish on this itinerary's threads only
+        pool.shutdown(wait=False, cancel_futures=True)
+        
+        translated = [future.result() if future in done and future.exception() is None else None for future in futures]
+        return self._apply_translations(itinerary, translated)
+    
+    def _translation_texts(self, itinerary: Itinerary) -> List[str]:
+        """Reasoning, then each day's theme and activities, as one flat list"""
+        texts = [itinerary.reasoning]
+        for day in itinerary.days:
+            texts.append(day.theme)
+            texts.extend(day.activities)
+        return texts
+    
+    def _apply_translations(self, itinerary: Itinerary, translated: List[Optional[str]]) -> Itinerary:
+        """Put translated texts back in place; None keeps the English text and flags the itinerary"""
+        originals = self._translation_texts(itinerary)
+        flags = list(itinerary.flags)
+        if translated[0] is None:
+            flags.append("untranslated_reasoning")
+        if any(text is None for text in translated[1:]):
+            flags.append("untranslated_activities")
+        texts = [text if text is not None else original for text, original in zip(translated, originals)]
+        
+        days, position = [], 1
+        for day in itinerary.days:
+            size = 1 + len(day.activities)
+            theme, *activities = texts[position:position + size]
+            days.append(day.replace(theme=theme, activities=activities))
+            position += size
+        return itinerary.replace(reasoning=texts[0], days=days, flags=flags)
+    
+    def _itinerary_from_cache(self, request: Dict) -> Optional[Itinerary]:
+        """Build an itinerary from a close cached match, recomputing route and costs"""
+        if self.itinerary_cache is None:
+            return None
         
         try:
-            # Translate key text fields
-            if "reasoning" in itinerary:
-                translated_itinerary["reasoning"] = self.translate_text(itinerary["reasoning"], target_language)
-            
-            # Translate daily plan activities
-            if "daily_plan" in itinerary:
-                translated_daily_plan = []
-                for day in itinerary["daily_plan"]:
-                    translated_day = day.copy()
-                    if "theme" in day:
-                        translated_day["theme"] = self.translate_text(day["theme"], target_language)
-                    if "activities" in day and isinstance(day["activities"], list):
-                        translated_day["activities"] = [
-                            self.translate_text(activity, target_language) 
-                            for activity in day["activities"]
-                        ]
-                    translated_daily_plan.append(translated_day)
-                translated_itinerary["daily_plan"] = translated_daily_plan
-                
+            cached = self.itinerary_cache.lookup(
+                request["destination_city"], request["mood"], request["budget"],
+                request["user_city"], request["duration"], request["transport_mode"]
+            )
         except Exception as e:
-            print(f"Translation error: {e}")
-            # Return original if translation fails
-            return itinerary
-            
-        return translated_itinerary
+            # A locked, full or damaged cache only costs the reuse, the request is planned afresh
+            print(f"Itinerary cache lookup failed: {e}")
+            return None
+        if cached is None:
+            return None
+        
+        # Stored days only fit a trip of the same length; otherwise select afresh for this duration and budget
+        activities = cached["activities"] if cached["duration"] == request["duration"] else None
+        itinerary = self.parse_ai_response(cached["reasoning"], activities=activities, **request)
+        itinerary.cache_hit = True
+        return itinerary
+    
+    def _itinerary_from_response(self, ai_response: Optional[str], prompt: str, request: Dict,
+                                 deadline: Optional[Deadline] = None) -> Itinerary:
+        """Parse a backend answer (None if it failed or ran out of time) and store real model output for reuse"""
+        deadline = deadline or Deadline()
+        from_model = ai_response is not None
+        if not from_model:
+            with deadline.stage("fallback"):
+                ai_response = self._generate_fallback_response(prompt, request)
+        
+        # Parse the response into structured format
+        with deadline.stage("parsing"):
+            itinerary = self.parse_ai_response(ai_response, **request)
+        
+        # Only real model output is worth reusing
+        if from_model and self.backend.cacheable and self.itinerary_cache is not None:
+            with deadline.stage("cache_store"):
+                try:
+                    self.itinerary_cache.store(
+                        request["destination_city"], request["mood"], request["budget"], request["user_city"],
+                        request["duration"], request["transport_mode"],
+                        ai_response, [list(day.activities) for day in itinerary.days]
+                    )
+                except Exception as e:
+                    print(f"Itinerary cache store failed: {e}")
+        
+        return itinerary if from_model else itinerary.replace(flags=["fallback_reasoning"])
+    
+    def _generate_response(self, prompt: str, request: Dict, deadline: Deadline) -> Optional[str]:
+        """Model answer within the deadline, from a speculation if one is running, else from the backend"""
+        with deadline.stage("generation"):
+            ai_response = None
+            if self.prefetcher is not None:
+                ai_response = self.prefetcher.claim(request, timeout=deadline.timeout(self.prefetcher.claim_timeout))
+            if ai_response is None and not deadline.expired():
+                ai_response = self._query_models(prompt, request=request, deadline=deadline)
+        return ai_response
     
-    def generate_itinerary(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str, language: str = "en") -> Dict:
-        """Generate a complete trip itinerary using AI with optional translation"""
+    def _generation_deadline(self, deadline: Deadline, language: str) -> Deadline:
+        """Keep time back for translation so a slow model cannot squeeze it out"""
+        if language == "en":
+            return deadline
+        # Never more than a quarter of what is left, short deadlines still get a model attempt
+        return deadline.reserve(min(self.translation_reserve_seconds, deadline.remaining() / 4))
+    
+    def _finish(self, itinerary: Itinerary, deadline: Deadline) -> Itinerary:
+        """Attach the stage timings, flagging results that ran past the deadline"""
+        flags = list(itinerary.flags)
+        if deadline.expired():
+            flags.append("deadline_exceeded")
+        timings = dict(deadline.timings, total=deadline.elapsed_ms())
+        return itinerary.replace(flags=flags, timings=timings)
+    
+    def _error_response(self, error: Exception, deadline: Optional[Deadline] = None) -> Dict:
+        """Structured error response returned instead of raising"""
+        return {
+            "error": True,
+            "message": f"Failed to generate itinerary: {str(error)}",
+            "destination": "Unable to generate",
+            "reasoning": "There was an error connecting to the AI service. Please try again later.",
+            "daily_plan": [],
+            "budget_breakdown": {},
+            "tips": ["Please check your internet connection and try again"],
+            "stage_timings_ms": dict(deadline.timings) if deadline is not None else {}
+        }
+    
+    def generate_itinerary(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str, language: str = "en",
+                           deadline: Optional[Deadline] = None) -> Mapping:
+        """Generate a complete trip itinerary using AI with optional translation
+        
+        Every stage works within ``deadline`` (``PLANNER_DEADLINE_SECONDS`` by default).
+        A model that does not answer in time is replaced by the template answer and
+        texts not translated in time stay in English; ``flags`` on the result say so.
+        """
+        deadline = deadline or Deadline(self.deadline_seconds)
         
         # Create the prompt
         prompt = self.prompts.create_trip_prompt(mood, budget, duration, user_city, destination_city, transport_mode)
+        request = {
+            "mood": mood, "budget": budget, "duration": duration, "user_city": user_city,
+            "destination_city": destination_city, "transport_mode": transport_mode
+        }
         
         # Query the AI
         try:
-            ai_response = self.query_huggingface_api(prompt)
-            
-            # Parse the response into structured format
-            itinerary = self.parse_ai_response(ai_response, mood, budget, duration, user_city, destination_city, transport_mode)
+            with deadline.stage("cache"):
+                itinerary = self._itinerary_from_cache(request)
+            if itinerary is None:
+                ai_response = self._generate_response(prompt, request, self._generation_deadline(deadline, language))
+                itinerary = self._itinerary_from_response(ai_response, prompt, request, deadline)
             
             # Translate if language is not English
             if language != "en":
-                itinerary = self.translate_itinerary(itinerary, language)
+                with deadline.stage("translation"):
+                    itinerary = self.translate_itinerary(itinerary, language, deadline)
+            
+            return self._finish(itinerary, deadline)
             
+        except Exception as e:
+            return self._error_response(e, deadline)
+    
+    async def atranslate_itinerary(self, itinerary: Itinerary, target_language: str, deadline: Optional[Deadline] = None) -> Itinerary:
+        """Translate itinerary content concurrently without blocking the event loop
+        
+        The texts are translated on the itinerary's own workers as in ``translate_itinerary``,
+        which returns at the deadline, so the default executor is never held by a slow translator.
+        """
+        if not self.translation_available or target_language == "en":
             return itinerary
+        return await asyncio.to_thread(self.translate_itinerary, itinerary, target_language, deadline)
+    
+    async def agenerate_itinerary(self, mood: str, budget: str, duration: int, user_city: str, destination_city: str, transport_mode: str, language: str = "en",
+                                  deadline: Optional[Deadline] = None) -> Mapping:
+        """Async variant of ``generate_itinerary`` with non-blocking upstream and translation I/O"""
+        deadline = deadline or Deadline(self.deadline_seconds)
+        
+        prompt = self.prompts.create_trip_prompt(mood, budget, duration, user_city, destination_city, transport_mode)
+        request = {
+            "mood": mood, "budget": budget, "duration": duration, "user_city": user_city,
+            "destination_city": destination_city, "transport_mode": transport_mode
+        }
+        
+        try:
+            # The cache is a local SQLite file, keep it off the event loop all the same
+            with deadline.stage("cache"):
+                itinerary = await asyncio.to_thread(self._itinerary_from_cache, request)
+            if itinerary is None:
+                generation_deadline = self._generation_deadline(deadline, language)
+                with deadline.stage("generation"):
+                    try:
+                        ai_response = await asyncio.wait_for(
+                            self.backend.agenerate(prompt, request=request, settings=self.generation.settings(),
+                                                   deadline=generation_deadline),
+                            generation_deadline.timeout()
+                        )
+                    except asyncio.TimeoutError:
+                        ai_response = None
+                    except Exception as e:
+                        print(f"Generation error: {e}")
+                        ai_response = None
+                itinerary = await asyncio.to_thread(self._itinerary_from_response, ai_response, prompt, request, deadline)
+            
+            if language != "en":
+                with deadline.stage("translation"):
+                    itinerary = await self.atranslate_itinerary(itinerary, language, deadline)
+            
+            return self._finish(itinerary, deadline)
             
         except Exception as e:
-            # Return a structured error response
-            return {
-                "error": True,
-                "message": f"Failed to generate itinerary: {str(e)}",
-                "destination": "Unable to generate",
-                "reasoning": "There was an error connecting to the AI service. Please try again later.",
-                "daily_plan": [],
-                "budget_breakdown": {},
-                "tips": ["Please check your internet connection and try again"]
-            }
+            return self._error_response(e, deadline)